@@ -1,6 +1,6 @@
 import os
-from datetime import timedelta, datetime
-from flask import Flask, jsonify, request, make_response, render_template, send_from_directory
+from datetime import timedelta, datetime, timezone
+from flask import Flask, jsonify, request, make_response, send_from_directory, Response, stream_with_context
 from flask_jwt_extended import (
     JWTManager, create_access_token, create_refresh_token,
     jwt_required, get_jwt_identity, decode_token, get_jwt
@@ -11,9 +11,19 @@ import pathlib
 import yaml
 import uuid
 import jwt 
-import glob
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from functools import lru_cache, wraps
+from cachetools import TLRUCache
+try:
+    from yaml import CSafeLoader, CSafeDumper
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader, SafeDumper as CSafeDumper
 from flask_swagger_ui import get_swaggerui_blueprint
-from swagger_config import get_swagger_dict, get_swagger_json, get_swagger_yaml
+from swagger_config import get_swagger_json, get_swagger_lean_json, get_swagger_yaml
 
 # Configure logging
 logging.basicConfig(
@@ -26,9 +36,14 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # Import authentication methods
-from auth.file_auth import authenticate_file
+from auth.file_auth import authenticate_file, check_sha256_throughput
 from auth.ldap_auth import authenticate_ldap, LDAP_AVAILABLE
-from utils.api_key import get_additional_claims, BASE_API_KEY_FILE
+from utils.api_key import (
+    API_KEYS_DIR, get_additional_claims, load_api_key_files, load_api_key_summaries, find_api_key_by_id,
+    invalidate_api_key_cache
+)
+from utils.json_provider import OrjsonProvider
+import orjson
 from utils.jwe_handler import (
     encrypt_jwt_token, decrypt_jwe_token,
     encrypt_payload_to_jwe, decrypt_jwe_to_payload,
@@ -43,6 +58,9 @@ templates_dir.mkdir(exist_ok=True)
 app = Flask(__name__, 
             template_folder=str(templates_dir))
 
+# Serialize JSON responses (jsonify) and parse request bodies with orjson
+app.json = OrjsonProvider(app)
+
 # Configure Swagger UI
 SWAGGER_URL = '/dspai-docs'  # URL for exposing Swagger UI
 API_URL = '/swagger.json'  # Where to get the swagger spec from
@@ -66,6 +84,11 @@ app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 def swagger_json():
     return get_swagger_json()
 
+@app.route('/swagger.lean.json')
+def swagger_lean_json():
+    # Compact variant for programmatic clients: no examples or descriptions
+    return get_swagger_lean_json()
+
 @app.route('/swagger.yaml')
 def swagger_yaml():
     return get_swagger_yaml()
@@ -88,31 +111,77 @@ if AUTH_METHOD == "ldap" and not LDAP_AVAILABLE:
     logger.warning("To use LDAP authentication, install python-ldap: pip install python-ldap")
     AUTH_METHOD = "file"
 
+# Resolve the authentication backend once; AUTH_METHOD never changes after startup
+_AUTHENTICATE = authenticate_ldap if AUTH_METHOD == "ldap" else authenticate_file
+
+# Authentication result cache, keyed by (auth method, username, peppered password digest).
+# Successes are reused for AUTH_CACHE_TTL seconds, which bounds how long a revoked user or
+# changed password keeps working. Rejected credentials are cached only briefly so repeated
+# bad guesses don't hit the backend, and backend errors (authenticated is None) never are.
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_REJECT_CACHE_TTL = int(os.getenv("AUTH_REJECT_CACHE_TTL", "5"))
+
+def _auth_cache_ttu(_key, result, now):
+    return now + (AUTH_CACHE_TTL if result[0] else AUTH_REJECT_CACHE_TTL)
+
+_AUTH_CACHE = TLRUCache(maxsize=10_000, ttu=_auth_cache_ttu, timer=time.monotonic)
+_AUTH_CACHE_LOCK = threading.RLock()
+# Pepper so raw passwords (or plain hashes of them) never sit in a cache as keys.
+# Random per process unless configured; a shared value is required for the Redis cache.
+_AUTH_CACHE_PEPPER = os.getenv("AUTH_CACHE_PEPPER", "").encode() or secrets.token_bytes(32)
+
+# Optional Redis backend so all worker processes share authentication results
+REDIS_URL = os.getenv("REDIS_URL")
+_AUTH_REDIS = None
+if REDIS_URL:
+    try:
+        import redis
+        if not os.getenv("AUTH_CACHE_PEPPER"):
+            logger.warning("REDIS_URL is set but AUTH_CACHE_PEPPER is not; using the in-process auth cache only.")
+        else:
+            _AUTH_REDIS = redis.Redis.from_url(REDIS_URL, decode_responses=False, socket_timeout=0.5)
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using the in-process auth cache only.")
+        logger.warning("To share the auth cache between workers, install redis: pip install redis")
+
+# Verified /decode results, keyed by a digest of the token string.
+# Entries live at most DECODE_CACHE_TTL seconds and never past the token's own expiry.
+DECODE_CACHE_TTL = 60
+
+def _decode_cache_ttu(_key, decoded, now):
+    return min(now + DECODE_CACHE_TTL, decoded.get('exp', now + DECODE_CACHE_TTL))
+
+_DECODE_CACHE = TLRUCache(maxsize=5000, ttu=_decode_cache_ttu, timer=time.time)
+_DECODE_CACHE_LOCK = threading.Lock()
+
 jwt = JWTManager(app)
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    # index.html has no template variables, so serve it as a static file browsers can cache
+    return send_from_directory(templates_dir, 'index.html', max_age=3600)
 
 @app.route('/token', methods=['POST'])
 def login():
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
 
-    username = request.json.get('username', None)
-    password = request.json.get('password', None)
-    api_key = request.json.get('api_key', None)
-    api_key_config = request.json.get('api_key_config', None)
-    custom_secret = request.json.get('secret', None)
+    username = data.get('username', None)
+    password = data.get('password', None)
+    api_key = data.get('api_key', None)
+    api_key_config = data.get('api_key_config', None)
+    custom_secret = data.get('secret', None)
 
     if not username or not password:
         return jsonify({"error": "Missing username or password"}), 400
 
-    # Authenticate based on the configured method
-    if AUTH_METHOD == "ldap":
-        authenticated, user_data = authenticate_ldap(username, password)
-    else:  # file-based authentication
-        authenticated, user_data = authenticate_file(username, password)
+    # Credentials are hashed and used as cache keys below, so they must be strings
+    if not isinstance(username, str) or not isinstance(password, str):
+        return jsonify({"error": "Invalid username or password"}), 401
+
+    # Authenticate based on the configured method (cached per credential pair)
+    authenticated, user_data = authenticate_user(username, password)
 
     if not authenticated:
         error_message = "Invalid username or password"
@@ -139,16 +208,16 @@ def login():
             # Additional context that might be needed by dynamic claims
             "api_key_id": api_key if api_key else api_key_config.get('id', 'inline_config')
         }
-        logger.info(f"Processing API key with user_context: {user_context}")
+        logger.info("Processing API key with user_context: %s", user_context)
         api_key_claims = get_additional_claims(api_key, user_context, api_key_config)
     else:
         api_key_claims = get_additional_claims(None, user_context, None)
 
     # Log which API key is being used
     if api_key_config:
-        logger.info(f"Using inline API key configuration: {api_key_config.get('id', 'no-id')}")
+        logger.info("Using inline API key configuration: %s", api_key_config.get('id', 'no-id'))
     elif api_key:
-        logger.info(f"Using provided API key: {api_key}")
+        logger.info("Using provided API key: %s", api_key)
     else:
         logger.info("No API key provided, using base API key")
 
@@ -159,7 +228,7 @@ def login():
     expires_delta = app.config["JWT_ACCESS_TOKEN_EXPIRES"]  # Default
     if 'exp_hours' in claims:
         expires_delta = timedelta(hours=claims['exp_hours'])
-        logger.info(f"Using custom expiration time from API key: {claims['exp_hours']} hours")
+        logger.info("Using custom expiration time from API key: %s hours", claims['exp_hours'])
         # Remove exp_hours from claims to avoid conflicts
         claims.pop('exp_hours')
     
@@ -169,7 +238,7 @@ def login():
         import datetime as dt
         
         # Log that we're using a custom secret
-        logger.info(f"Using custom secret for token generation")
+        logger.info("Using custom secret for token generation")
         
         # Prepare the payload with the standard JWT claims
         now = dt.datetime.now(dt.timezone.utc)
@@ -232,7 +301,7 @@ def login():
                     env_var = encryption_key[2:-1]
                     encryption_key = os.getenv(env_var)
                     if not encryption_key:
-                        logger.error(f"JWE encryption key environment variable not set: {env_var}")
+                        logger.error("JWE encryption key environment variable not set: %s", env_var)
                         return jsonify({"error": "JWE encryption key not configured"}), 500
                 
                 content_encryption = jwe_config.get('encryption', 'A256GCM')
@@ -266,11 +335,106 @@ def login():
                 }), 200
                 
             except Exception as e:
-                logger.error(f"Error encrypting tokens with JWE: {str(e)}")
+                logger.error("Error encrypting tokens with JWE: %s", e)
                 return jsonify({"error": f"JWE encryption failed: {str(e)}"}), 500
         
         return jsonify(access_token=access_token, refresh_token=refresh_token), 200
 
+def log_hashing_throughput():
+    """
+    Log legacy SHA-256 password hashing throughput when file authentication is used
+    
+    Runs a short hashing benchmark, so it is called once by the server entry points
+    (run_https.py, the gunicorn when_ready hook) rather than on import.
+    """
+    if AUTH_METHOD != "ldap":
+        check_sha256_throughput()
+
+def authenticate_user(username, password):
+    """
+    Authenticate a user with the configured method, reusing recent results
+    
+    Args:
+        username: The username to authenticate
+        password: The password for authentication
+        
+    Returns:
+        Tuple of (authenticated, user_data) as returned by the auth backend;
+        authenticated is None if the backend failed rather than rejected the credentials
+    """
+    password_digest = hmac.new(_AUTH_CACHE_PEPPER, password.encode(), 'sha256').digest()
+    cache_key = (AUTH_METHOD, username, password_digest)
+    
+    with _AUTH_CACHE_LOCK:
+        cached = _AUTH_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Fall through to the shared Redis cache before hitting the auth backend
+    redis_key = None
+    if _AUTH_REDIS is not None:
+        redis_key = b"auth:" + hashlib.blake2b(
+            f"{AUTH_METHOD}:{username}".encode() + password_digest, digest_size=16
+        ).digest()
+        cached = _get_shared_auth_result(redis_key)
+        if cached is not None:
+            with _AUTH_CACHE_LOCK:
+                _AUTH_CACHE[cache_key] = cached
+            return cached
+    
+    result = _AUTHENTICATE(username, password)
+    if result[0] is None:
+        # Backend error, not a verdict on the credentials; retry on the next request
+        return result
+    
+    with _AUTH_CACHE_LOCK:
+        _AUTH_CACHE[cache_key] = result
+    # Only successes are shared; a rejection stays local to this worker's short-lived cache
+    if redis_key is not None and result[0]:
+        _set_shared_auth_result(redis_key, result)
+    return result
+
+def _get_shared_auth_result(redis_key):
+    """Read an authentication result from Redis, or None on a miss or Redis error"""
+    try:
+        raw = _AUTH_REDIS.get(redis_key)
+    except redis.RedisError as e:
+        logger.warning("Redis auth cache read failed: %s", e)
+        return None
+    if raw is None:
+        return None
+    try:
+        authenticated, user_data = orjson.loads(raw)
+    except (orjson.JSONDecodeError, ValueError, TypeError):
+        logger.warning("Ignoring malformed entry in the Redis auth cache")
+        return None
+    if authenticated is not True or not isinstance(user_data, dict):
+        return None
+    return authenticated, user_data
+
+def _set_shared_auth_result(redis_key, result):
+    """Store an authentication result in Redis, ignoring Redis errors"""
+    try:
+        _AUTH_REDIS.set(redis_key, orjson.dumps(result), ex=AUTH_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning("Redis auth cache write failed: %s", e)
+
+# Group -> team mapping, checked in priority order
+TEAM_GROUP_PRIORITY = (
+    ("administrators", "admin-team"),
+    ("admins", "admin-team"),
+    ("ai-team", "ai-team"),
+    ("ml-team", "ml-team"),
+)
+DEFAULT_TEAM_ID = "general-users"
+
+@lru_cache(maxsize=1024)
+def _team_for_groups(groups: frozenset) -> str:
+    for group, team_id in TEAM_GROUP_PRIORITY:
+        if group in groups:
+            return team_id
+    return DEFAULT_TEAM_ID
+
 def get_team_id_from_user(username, user_data):
     """
     Determine the team ID from the user's data
@@ -283,18 +447,8 @@ def get_team_id_from_user(username, user_data):
     Returns:
         A team ID string
     """
-    # Simple mapping based on groups
-    groups = user_data.get("groups", [])
-    
-    if "administrators" in groups or "admins" in groups:
-        return "admin-team"
-    elif "ai-team" in groups:
-        return "ai-team"
-    elif "ml-team" in groups:
-        return "ml-team"
-    
-    # Default team
-    return "general-users"
+    # Simple mapping based on groups, memoized per unique group set
+    return _team_for_groups(frozenset(user_data.get("groups", ())))
 
 def get_jwe_config_from_api_key(api_key: str = None, api_key_config: dict = None) -> dict:
     """
@@ -322,12 +476,11 @@ def get_jwe_config_from_api_key(api_key: str = None, api_key_config: dict = None
         
         # Otherwise load from file
         if api_key:
-            api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-            specific_key_file = os.path.join(api_keys_dir, f"{api_key}.yaml")
+            specific_key_file = os.path.join(API_KEYS_DIR, f"{api_key}.yaml")
             
             if os.path.exists(specific_key_file):
                 with open(specific_key_file, 'r') as f:
-                    key_data = yaml.safe_load(f)
+                    key_data = yaml.load(f, Loader=CSafeLoader)
                     jwe_config = key_data.get('jwe_config', {})
                     if jwe_config.get('enabled', False):
                         return jwe_config
@@ -338,6 +491,9 @@ def get_jwe_config_from_api_key(api_key: str = None, api_key_config: dict = None
         logger.error(f"Error getting JWE config: {str(e)}")
         return {}
 
+# JWT reserved claims that are regenerated rather than carried over on refresh
+_RESERVED_CLAIMS = frozenset({'exp', 'iat', 'nbf', 'jti', 'type', 'fresh'})
+
 @app.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
@@ -346,9 +502,8 @@ def refresh():
     jwt_claims = get_jwt()
     
     # Remove JWT reserved claims that shouldn't be transferred
-    reserved_claims = ['exp', 'iat', 'nbf', 'jti', 'type', 'fresh']
     additional_claims = {key: value for key, value in jwt_claims.items() 
-                         if key not in reserved_claims}
+                         if key not in _RESERVED_CLAIMS}
     
     # Create new access token with the same additional claims
     access_token = create_access_token(
@@ -356,22 +511,24 @@ def refresh():
         additional_claims=additional_claims
     )
     
-    # Log the claims being carried over
-    logger.info(f"Refreshing token for user {current_user} with claims: {additional_claims}")
+    # Log the claims being carried over (skip rendering the claims dict unless debugging)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Refreshing token for user %s with claims: %s", current_user, additional_claims)
     
     return jsonify(access_token=access_token), 200
 
 @app.route('/decode', methods=['POST'])
 def decode():
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
 
-    token = request.json.get('token', None)
+    token = data.get('token', None)
     if not token:
         return jsonify({"error": "Missing token"}), 400
         
-    skip_verification = request.json.get('skipVerification', False)
-    custom_secret = request.json.get('secret')
+    skip_verification = data.get('skipVerification', False)
+    custom_secret = data.get('secret')
     
     # Determine which secret to use
     secret_key = custom_secret if custom_secret else app.config['JWT_SECRET_KEY']
@@ -386,8 +543,8 @@ def decode():
                 decoded = jwt.decode(token, secret_key, algorithms=[algorithm])
                 decoded["note"] = "Decoded using provided custom secret"
             else:
-                # Use system default decode_token method
-                decoded = decode_token(token)
+                # Use system default decode_token method (verified results are cached briefly)
+                decoded = decode_token_cached(token)
             return jsonify(decoded), 200
         except Exception as e:
             # If verification fails and skipVerification is enabled, try decoding without verification
@@ -412,13 +569,36 @@ def decode():
     except Exception as e:
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
+def decode_token_cached(token):
+    """
+    Verify and decode a token with the application secret, reusing recent results
+    
+    Args:
+        token: The encoded JWT string
+        
+    Returns:
+        The decoded claims dict (raises like decode_token on invalid tokens)
+    """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    with _DECODE_CACHE_LOCK:
+        decoded = _DECODE_CACHE.get(cache_key)
+    if decoded is not None and decoded.get('exp', float('inf')) > time.time():
+        return decoded
+    
+    decoded = decode_token(token)
+    with _DECODE_CACHE_LOCK:
+        _DECODE_CACHE[cache_key] = decoded
+    return decoded
+
 @app.route('/validate', methods=['POST'])
 def validate_token():
     """Validate a JWT token's signature and expiration"""
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
 
-    token = request.json.get('token', None)
+    token = data.get('token', None)
     if not token:
         return jsonify({"error": "Missing token"}), 400
     
@@ -463,110 +643,89 @@ def protected():
     current_user = get_jwt_identity()
     return jsonify(logged_in_as=current_user), 200
 
+# Static part of the sensitive action response, copied per request
+_SENSITIVE_ACTION_RESPONSE = {
+    "message": "Sensitive action performed successfully",
+    "token_status": "Fresh token confirmed"
+}
+
 @app.route('/sensitive-action', methods=['POST'])
 @jwt_required(fresh=True)
 def sensitive_action():
     """This endpoint requires a fresh token (from direct login, not from refresh)"""
-    current_user = get_jwt_identity()
-    jwt_claims = get_jwt()
-    
     # Demo of a sensitive action like password change, payment, etc.
-    return jsonify({
-        "message": "Sensitive action performed successfully",
-        "user": current_user,
-        "token_status": "Fresh token confirmed",
-        "token_freshness": jwt_claims.get('fresh', False),
-        "action_time": str(datetime.now())
-    }), 200
+    response = _SENSITIVE_ACTION_RESPONSE.copy()
+    response["user"] = get_jwt_identity()
+    response["token_freshness"] = get_jwt().get('fresh', False)
+    response["action_time"] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    return jsonify(response), 200
 
 # API Key Management Endpoints
+
+# Groups whose members may manage API keys
+_ADMIN_GROUPS = frozenset({"administrators", "admins"})
+
+def require_admin(fn):
+    """Reject the request with 403 unless the JWT's groups include an admin group"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        groups = get_jwt().get('groups') or ()
+        if _ADMIN_GROUPS.isdisjoint(groups):
+            return jsonify({"error": "Administrator access required"}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
 @app.route('/api-keys', methods=['GET'])
 @jwt_required(fresh=True)
+@require_admin
 def get_api_keys():
     """Get a list of all API keys"""
-    # Only allow administrators to access this endpoint
-    claims = get_jwt()
-    groups = claims.get('groups', [])
-    
-    if 'administrators' not in groups and 'admins' not in groups:
-        return jsonify({"error": "Administrator access required"}), 403
-    
-    # Get API keys directory path
-    api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-    
-    if not os.path.exists(api_keys_dir):
+    if not os.path.exists(API_KEYS_DIR):
         return jsonify({"error": "API keys directory not found"}), 500
     
-    # Get all API key files (excluding base key)
-    api_key_files = glob.glob(os.path.join(api_keys_dir, "*.yaml"))
-    api_keys = []
+    # Snapshot the summaries shaped at parse time (excluding base key)
+    summaries = load_api_key_summaries(API_KEYS_DIR)
     
-    for key_file in api_key_files:
-        filename = os.path.basename(key_file)
-        if filename != BASE_API_KEY_FILE:
+    def generate():
+        # Stream the JSON array one entry at a time instead of building the full list
+        yield b'['
+        first = True
+        for summary in summaries:
             try:
-                with open(key_file, 'r') as f:
-                    key_data = yaml.safe_load(f)
-                    
-                api_keys.append({
-                    'filename': filename,
-                    'id': key_data.get('id', ''),
-                    'owner': key_data.get('owner', ''),
-                    'provider_permissions': key_data.get('provider_permissions', []),
-                    'endpoint_permissions': key_data.get('endpoint_permissions', []),
-                    'static_claims': key_data.get('claims', {}).get('static', {})
-                })
+                entry = orjson.dumps(summary, option=orjson.OPT_NON_STR_KEYS)
             except Exception as e:
-                logger.error(f"Error reading API key file {filename}: {str(e)}")
-    
-    return jsonify(api_keys), 200
+                logger.error(f"Error serializing API key {summary['filename']}: {str(e)}")
+                continue
+            if not first:
+                yield b','
+            first = False
+            yield entry
+        yield b']'
+    
+    return Response(stream_with_context(generate()), status=200, mimetype='application/json')
 
 @app.route('/api-keys/<api_key_id>', methods=['GET'])
 @jwt_required(fresh=True)
+@require_admin
 def get_api_key(api_key_id):
     """Get details for a specific API key"""
-    # Only allow administrators to access this endpoint
-    claims = get_jwt()
-    groups = claims.get('groups', [])
-    
-    if 'administrators' not in groups and 'admins' not in groups:
-        return jsonify({"error": "Administrator access required"}), 403
-    
-    # Get API keys directory path
-    api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-    
-    # Look for the API key file
-    api_key_files = glob.glob(os.path.join(api_keys_dir, "*.yaml"))
-    
-    for key_file in api_key_files:
-        try:
-            with open(key_file, 'r') as f:
-                key_data = yaml.safe_load(f)
-                
-                if key_data.get('id') == api_key_id:
-                    return jsonify(key_data), 200
-        except Exception as e:
-            logger.error(f"Error reading API key file {key_file}: {str(e)}")
+    # Look up the API key file through the id index
+    key_data = find_api_key_by_id(API_KEYS_DIR, api_key_id)
+    if key_data is None:
+        return jsonify({"error": "API key not found"}), 404
     
-    return jsonify({"error": "API key not found"}), 404
+    return jsonify(key_data), 200
 
 @app.route('/api-keys', methods=['POST'])
 @jwt_required(fresh=True)
+@require_admin
 def create_api_key():
     """Create a new API key"""
-    # Only allow administrators to access this endpoint
-    claims = get_jwt()
-    groups = claims.get('groups', [])
-    
-    if 'administrators' not in groups and 'admins' not in groups:
-        return jsonify({"error": "Administrator access required"}), 403
-    
     # Check request data
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
     
-    data = request.json
-    
     # Validate required fields
     required_fields = ['owner']
     missing_fields = [field for field in required_fields if field not in data]
@@ -575,8 +734,8 @@ def create_api_key():
         return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
     
     # Generate API key string and ID
-    api_key_string = str(uuid.uuid4()).replace('-', '')
-    api_key_id = f"api-key-{str(uuid.uuid4())[:8]}"
+    api_key_string = secrets.token_hex(16)
+    api_key_id = f"api-key-{secrets.token_hex(4)}"
     
     # Create API key data
     api_key_data = {
@@ -596,19 +755,14 @@ def create_api_key():
         }
     }
     
-    # Get API keys directory path
-    api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-    
-    # Ensure API keys directory exists
-    if not os.path.exists(api_keys_dir):
-        os.makedirs(api_keys_dir)
-    
     # Save API key to file
-    api_key_file = os.path.join(api_keys_dir, f"{api_key_string}.yaml")
+    api_key_file = os.path.join(API_KEYS_DIR, f"{api_key_string}.yaml")
     
     try:
+        os.makedirs(API_KEYS_DIR, exist_ok=True)
         with open(api_key_file, 'w') as f:
-            yaml.dump(api_key_data, f, default_flow_style=False)
+            yaml.dump(api_key_data, f, Dumper=CSafeDumper, default_flow_style=False)
+        invalidate_api_key_cache(API_KEYS_DIR, os.path.basename(api_key_file))
     except Exception as e:
         logger.error(f"Error creating API key file: {str(e)}")
         return jsonify({"error": f"Failed to create API key: {str(e)}"}), 500
@@ -621,34 +775,25 @@ def create_api_key():
 
 @app.route('/api-keys/<api_key_string>', methods=['PUT'])
 @jwt_required(fresh=True)
+@require_admin
 def update_api_key(api_key_string):
     """Update an existing API key"""
-    # Only allow administrators to access this endpoint
-    claims = get_jwt()
-    groups = claims.get('groups', [])
-    
-    if 'administrators' not in groups and 'admins' not in groups:
-        return jsonify({"error": "Administrator access required"}), 403
-    
     # Check request data
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
     
-    data = request.json
-    
-    # Get API keys directory path
-    api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-    
     # Check if API key file exists
-    api_key_file = os.path.join(api_keys_dir, f"{api_key_string}.yaml")
+    api_key_file = os.path.join(API_KEYS_DIR, f"{api_key_string}.yaml")
     
     if not os.path.exists(api_key_file):
         return jsonify({"error": "API key not found"}), 404
     
     try:
-        # Read existing API key data
-        with open(api_key_file, 'r') as f:
-            existing_data = yaml.safe_load(f)
+        # Read existing API key data from the registry
+        existing_data = load_api_key_files(API_KEYS_DIR).get(os.path.basename(api_key_file))
+        if existing_data is None:
+            raise ValueError("API key file could not be parsed")
         
         # Update API key data with new values while preserving the ID
         api_key_id = existing_data['id']
@@ -669,7 +814,8 @@ def update_api_key(api_key_string):
         
         # Save updated API key to file
         with open(api_key_file, 'w') as f:
-            yaml.dump(updated_data, f, default_flow_style=False)
+            yaml.dump(updated_data, f, Dumper=CSafeDumper, default_flow_style=False)
+        invalidate_api_key_cache(API_KEYS_DIR, os.path.basename(api_key_file))
         
         return jsonify(updated_data), 200
     except Exception as e:
@@ -678,20 +824,11 @@ def update_api_key(api_key_string):
 
 @app.route('/api-keys/<api_key_string>', methods=['DELETE'])
 @jwt_required(fresh=True)
+@require_admin
 def delete_api_key(api_key_string):
     """Delete an API key"""
-    # Only allow administrators to access this endpoint
-    claims = get_jwt()
-    groups = claims.get('groups', [])
-    
-    if 'administrators' not in groups and 'admins' not in groups:
-        return jsonify({"error": "Administrator access required"}), 403
-    
-    # Get API keys directory path
-    api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-    
     # Check if API key file exists
-    api_key_file = os.path.join(api_keys_dir, f"{api_key_string}.yaml")
+    api_key_file = os.path.join(API_KEYS_DIR, f"{api_key_string}.yaml")
     
     if not os.path.exists(api_key_file):
         return jsonify({"error": "API key not found"}), 404
@@ -699,6 +836,7 @@ def delete_api_key(api_key_string):
     try:
         # Delete API key file
         os.remove(api_key_file)
+        invalidate_api_key_cache(API_KEYS_DIR, os.path.basename(api_key_file))
         return jsonify({"message": "API key deleted successfully"}), 200
     except Exception as e:
         logger.error(f"Error deleting API key: {str(e)}")
@@ -716,13 +854,18 @@ def encrypt_jwe():
         "payload": {...},               # Optional: Payload dict to encrypt directly
         "encryption_key": "base64_key", # Required: Symmetric encryption key
         "encryption": "A256GCM",        # Optional: Encryption algorithm (default: A256GCM)
-        "compression": null             # Optional: Compression (null or "DEF")
+        "compression": null,            # Optional: Compression (null or "DEF")
+        "return_digest": false          # Optional: Also return SHA-256 of the plaintext
     }
+    
+    With return_digest, the response includes plaintext_sha256: the hex SHA-256 of the
+    token string, or of the payload as compact JSON with sorted keys, so callers can
+    check the round trip without calling /decrypt-jwe.
     """
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
     
-    data = request.json
     token = data.get('token')
     payload = data.get('payload')
     encryption_key = data.get('encryption_key')
@@ -753,11 +896,16 @@ def encrypt_jwe():
                 compression
             )
         
-        return jsonify({
+        result = {
             "jwe_token": encrypted,
             "encryption": content_encryption,
             "compression": compression
-        }), 200
+        }
+        if data.get('return_digest'):
+            plaintext = token.encode('utf-8') if token else orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+            result["plaintext_sha256"] = hashlib.sha256(plaintext).hexdigest()
+        
+        return jsonify(result), 200
         
     except Exception as e:
         logger.error(f"Error encrypting with JWE: {str(e)}")
@@ -776,10 +924,10 @@ def decrypt_jwe():
         "extract_jwt": true               # Optional: If true, extract JWT from payload
     }
     """
-    if not request.is_json:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         return jsonify({"error": "Missing JSON in request"}), 400
     
-    data = request.json
     jwe_token = data.get('jwe_token')
     encryption_key = data.get('encryption_key')
     content_encryption = data.get('encryption', 'A256GCM')
@@ -829,7 +977,7 @@ def generate_jwe_key():
         "format": "base64"       # Optional: Output format (base64 or hex, default: base64)
     }
     """
-    data = request.json if request.is_json else {}
+    data = request.get_json(silent=True) or {}
     algorithm = data.get('algorithm', 'A256GCM')
     output_format = data.get('format', 'base64')
     
@@ -917,4 +1065,12 @@ def request_debug_info():
     return jsonify(response_data), 200
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=int(os.getenv('PORT', 5000)))
+    # Development server only; the reloader and debugger are opt-in via FLASK_DEBUG=1.
+    # In production run under gunicorn, e.g.:
+    #   gunicorn -w $(nproc) -k gthread --threads 8 app:app
+    app.run(
+        debug=os.getenv('FLASK_DEBUG') == '1',
+        host='0.0.0.0',
+        port=int(os.getenv('PORT', 5000)),
+        threaded=True
+    )
@@ -1,14 +1,210 @@
 import os
 import yaml
+import orjson
 import logging
 import hashlib
+import hmac
+import threading
+import time
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Prefer the libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+
 logger = logging.getLogger(__name__)
 
-def authenticate_file(username: str, password: str) -> Tuple[bool, Dict]:
+# Try to import bcrypt, but make it optional so legacy SHA-256 users files keep working
+BCRYPT_AVAILABLE = False
+try:
+    import bcrypt
+    BCRYPT_AVAILABLE = True
+except ImportError:
+    logger.warning("bcrypt module not installed. Only legacy SHA-256 password hashes can be verified.")
+    logger.warning("To enable bcrypt password hashes, install bcrypt: pip install bcrypt")
+
+# Cost factor for newly generated bcrypt hashes
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Parsed users file, reloaded only when its path or mtime changes
+_USERS_CACHE = {"path": None, "mtime": 0, "data": {}}
+_USERS_CACHE_LOCK = threading.Lock()
+
+# (json path, json mtime, yaml mtime) last warned about as stale, so the warning
+# is logged once per change instead of on every login
+_STALE_JSON_WARNED = None
+
+def _users_source(users_file: str) -> Tuple[str, int]:
+    """
+    Pick the file to load users from: a users.json produced by convert_users.py next to
+    the YAML file is preferred, as long as it is at least as new as the YAML file
+    
+    Args:
+        users_file: Path to the users YAML (or JSON) file
+        
+    Returns:
+        Tuple of (path to load, its mtime in nanoseconds)
+        
+    Raises:
+        FileNotFoundError: If neither file exists
+    """
+    if users_file.endswith('.json'):
+        return users_file, os.stat(users_file).st_mtime_ns
+    
+    json_file = os.path.splitext(users_file)[0] + '.json'
+    try:
+        json_mtime = os.stat(json_file).st_mtime_ns
+    except FileNotFoundError:
+        return users_file, os.stat(users_file).st_mtime_ns
+    
+    try:
+        yaml_mtime = os.stat(users_file).st_mtime_ns
+    except FileNotFoundError:
+        return json_file, json_mtime
+    
+    if json_mtime >= yaml_mtime:
+        return json_file, json_mtime
+    
+    global _STALE_JSON_WARNED
+    stale = (json_file, json_mtime, yaml_mtime)
+    if _STALE_JSON_WARNED != stale:
+        _STALE_JSON_WARNED = stale
+        logger.warning("%s is older than %s; loading YAML (rerun convert_users.py)", json_file, users_file)
+    return users_file, yaml_mtime
+
+def _normalize_users(users: Dict) -> None:
+    """Store each user's groups and roles as tuples once, so logins can hand them out without copying"""
+    for user_data in users.values():
+        if isinstance(user_data, dict):
+            user_data['groups'] = tuple(user_data.get('groups') or ())
+            user_data['roles'] = tuple(user_data.get('roles') or ())
+
+def load_users(users_file: str) -> Dict:
+    """
+    Load the users file, reusing the parsed data while the file is unchanged
+    
+    Args:
+        users_file: Path to the users YAML file
+        
+    Returns:
+        Dict mapping username to user data (shared with the cache - do not mutate)
+        
+    Raises:
+        FileNotFoundError: If the users file does not exist
+    """
+    path, mtime = _users_source(users_file)
+    with _USERS_CACHE_LOCK:
+        if _USERS_CACHE["path"] == path and _USERS_CACHE["mtime"] == mtime:
+            return _USERS_CACHE["data"]
+        
+        if path.endswith('.json'):
+            with open(path, 'rb') as f:
+                users = orjson.loads(f.read()) or {}
+        else:
+            with open(path, 'r') as f:
+                users = yaml.load(f, Loader=CSafeLoader) or {}
+        
+        _normalize_users(users)
+        _USERS_CACHE.update(path=path, mtime=mtime, data=users)
+        return users
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with bcrypt for storage in the users file
+    
+    Args:
+        password: The plain text password
+        
+    Returns:
+        The bcrypt hash string ($2b$...)
+    """
+    if not BCRYPT_AVAILABLE:
+        raise RuntimeError("bcrypt is required to hash passwords. Install bcrypt package.")
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+# Below this SHA-256 throughput the OpenSSL build is likely not using CPU SHA extensions
+# (portable implementations typically manage 0.2-0.4 GiB/s)
+SHA256_MIN_GIBPS = 0.5
+
+def check_sha256_throughput(size: int = 1 << 20) -> float:
+    """
+    Hash a buffer once and log SHA-256 throughput, warning if it looks unaccelerated
+    
+    hashlib.sha256 is backed by OpenSSL, which uses SHA-NI (x86) or the ARMv8 SHA
+    extensions when the CPU has them. This makes a misconfigured build visible at startup.
+    
+    Args:
+        size: Number of bytes to hash per run (default 1 MiB)
+        
+    Returns:
+        Measured throughput in GiB/s
+    """
+    data = bytes(size)
+    # Best of a few runs so a cold cache or scheduler hiccup doesn't trigger a false warning
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        hashlib.sha256(data).digest()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    gibps = size / max(elapsed, 1e-9) / (1 << 30)
+    
+    cpu_has_sha = None
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+        cpu_has_sha = " sha_ni" in flags or " sha2" in flags
+    except OSError:
+        pass
+    
+    logger.info("SHA-256 throughput: %.2f GiB/s (CPU SHA extensions: %s)", gibps,
+                "unknown" if cpu_has_sha is None else cpu_has_sha)
+    if gibps < SHA256_MIN_GIBPS:
+        logger.warning(
+            "SHA-256 throughput is below %.1f GiB/s; check that OpenSSL is not built or "
+            "configured (e.g. OPENSSL_ia32cap) to disable CPU SHA extensions", SHA256_MIN_GIBPS
+        )
+    return gibps
+
+# Pre-initialized SHA-256 state; copy() is cheaper than constructing a new hash object per login
+_SHA256_BASE = hashlib.sha256()
+
+@lru_cache(maxsize=1024)
+def _legacy_digest(stored_password: str) -> Optional[bytes]:
+    """Decode a stored SHA-256 hex hash to raw bytes once, or None if it isn't valid hex"""
+    try:
+        return bytes.fromhex(stored_password)
+    except ValueError:
+        return None
+
+def verify_password(password: str, stored_password: str) -> bool:
+    """
+    Check a password against a stored bcrypt or legacy SHA-256 hex hash
+    
+    Args:
+        password: The plain text password
+        stored_password: The hash from the users file
+        
+    Returns:
+        True if the password matches, False otherwise
+    """
+    if stored_password.startswith("$2"):
+        if not BCRYPT_AVAILABLE:
+            logger.error("bcrypt password hash found but bcrypt module is not installed")
+            return False
+        return bcrypt.checkpw(password.encode(), stored_password.encode())
+    
+    # Legacy unsalted SHA-256, compared as raw digests in constant time
+    stored_digest = _legacy_digest(stored_password)
+    if stored_digest is None:
+        return False
+    h = _SHA256_BASE.copy()
+    h.update(password.encode('utf-8'))
+    return hmac.compare_digest(h.digest(), stored_digest)
+
+def authenticate_file(username: str, password: str) -> Tuple[Optional[bool], Dict]:
     """
     Authenticate a user using a users file
     
@@ -18,38 +214,33 @@ def authenticate_file(username: str, password: str) -> Tuple[bool, Dict]:
         
     Returns:
         Tuple containing:
-            - Boolean indicating if authentication was successful
+            - True if authentication was successful, False if the credentials were
+              rejected, None if the users file could not be read (not a verdict)
             - Dict with user data if successful, empty dict otherwise
     """
     try:
         # Get user file path from environment variable or use default
         users_file = os.getenv("USERS_FILE", "config/users.yaml")
         
-        # Check if file exists
-        if not os.path.exists(users_file):
-            logger.error(f"Users file not found: {users_file}")
-            return False, {}
-        
-        # Load users from file
-        with open(users_file, 'r') as f:
-            users = yaml.safe_load(f)
+        # Load users from file (cached until the file changes)
+        try:
+            users = load_users(users_file)
+        except FileNotFoundError:
+            logger.error("Users file not found: %s", users_file)
+            return None, {}
         
         # Check if user exists
         if username not in users:
-            logger.warning(f"User {username} not found in users file")
+            logger.warning("User %s not found in users file", username)
             return False, {}
         
         user_data = users[username]
         
-        # Verify password
-        # Note: In production, you'd want to use a secure password hashing library like bcrypt
+        # Verify password (bcrypt, or legacy SHA-256 for older users files)
         stored_password = user_data.get('password', '')
         
-        # Simple SHA-256 hashing for demonstration purposes
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        
-        if stored_password != hashed_password:
-            logger.warning(f"Invalid password for user {username}")
+        if not verify_password(password, stored_password):
+            logger.warning("Invalid password for user %s", username)
             return False, {}
         
         # Authentication successful
@@ -58,12 +249,12 @@ def authenticate_file(username: str, password: str) -> Tuple[bool, Dict]:
             "sub": username,
             "name": user_data.get('name', username),
             "email": user_data.get('email', ''),
-            "groups": user_data.get('groups', []),
-            "roles": user_data.get('roles', [])
+            "groups": user_data['groups'],
+            "roles": user_data['roles']
         }
         
         return True, claims
         
     except Exception as e:
-        logger.error(f"Unexpected error during file authentication: {str(e)}")
-        return False, {}
+        logger.error("Unexpected error during file authentication: %s", e)
+        return None, {}
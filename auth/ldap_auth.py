@@ -1,21 +1,209 @@
 import os
 import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
 from typing import Dict, Tuple, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Try to import ldap, but make it optional
 LDAP_AVAILABLE = False
 try:
     import ldap
+    import ldap.dn
     LDAP_AVAILABLE = True
 except ImportError:
     logger.warning("python-ldap module not installed. LDAP authentication will not be available.")
     logger.warning("To enable LDAP authentication, install python-ldap: pip install python-ldap")
 
-def authenticate_ldap(username: str, password: str) -> Tuple[bool, Dict]:
+# LDAP configuration, read from the environment once at import
+LdapConfig = namedtuple("LdapConfig", [
+    "server", "base_dn", "user_dn", "admin_dn", "admin_password", "network_timeout",
+    "start_tls", "tls_cacertfile"
+])
+LDAP_CONFIG = LdapConfig(
+    server=os.getenv("LDAP_SERVER", "ldap://localhost:389"),
+    base_dn=os.getenv("LDAP_BASE_DN", "dc=example,dc=com"),
+    user_dn=os.getenv("LDAP_USER_DN", "cn=users,dc=example,dc=com"),
+    admin_dn=os.getenv("LDAP_ADMIN_DN", ""),
+    admin_password=os.getenv("LDAP_ADMIN_PASSWORD", ""),
+    network_timeout=float(os.getenv("LDAP_NETWORK_TIMEOUT", "5")),
+    start_tls=os.getenv("LDAP_START_TLS", "false").lower() == "true",
+    tls_cacertfile=os.getenv("LDAP_TLS_CACERTFILE", "")
+)
+
+# RFC 4515 escapes for filter assertion values, applied with one str.translate call
+_LDAP_FILTER_ESCAPE = str.maketrans({
+    '\\': r'\5c',
+    '*': r'\2a',
+    '(': r'\28',
+    ')': r'\29',
+    '\x00': r'\00'
+})
+
+# Usernames longer than this are rejected before any LDAP traffic
+LDAP_MAX_USERNAME_LENGTH = 256
+
+def _user_search_filter(username: str) -> str:
+    """
+    Build the user search filter with the username escaped, so input such as "*)(|"
+    can't widen the search. Callers must bound the username length first.
+    """
+    return "(sAMAccountName=" + username.translate(_LDAP_FILTER_ESCAPE) + ")"
+
+# Bound once so attribute values can be decoded with map() instead of per-item lookups
+_decode = bytes.decode
+
+def _decode_first(user_data: Dict, attr: str, default: str = "") -> str:
+    """Decode the first value of a multi-valued LDAP attribute, or return the default"""
+    value = next(iter(user_data.get(attr, ())), None)
+    return default if value is None else _decode(value)
+
+# Admin connection pool settings (seconds for lifetime/keepalive/timeout)
+LDAP_POOL_SIZE = int(os.getenv("LDAP_POOL_SIZE", "10"))
+LDAP_POOL_LIFETIME = int(os.getenv("LDAP_POOL_LIFETIME", "600"))
+LDAP_POOL_KEEPALIVE = int(os.getenv("LDAP_POOL_KEEPALIVE", "30"))
+LDAP_POOL_TIMEOUT = float(os.getenv("LDAP_POOL_TIMEOUT", "5"))
+
+def _initialize(ldap_server: str, reconnect: bool = False):
+    """Open a new LDAP v3 connection without following referrals"""
+    if reconnect:
+        # Transparently re-establishes and rebinds the connection if the server drops it
+        conn = ldap.ldapobject.ReconnectLDAPObject(ldap_server, retry_max=2, retry_delay=0.5)
+    else:
+        conn = ldap.initialize(ldap_server)
+    conn.protocol_version = 3
+    conn.set_option(ldap.OPT_REFERRALS, 0)
+    # Fail fast instead of hanging the worker thread when the server is unreachable
+    conn.set_option(ldap.OPT_NETWORK_TIMEOUT, LDAP_CONFIG.network_timeout)
+    if LDAP_CONFIG.tls_cacertfile:
+        conn.set_option(ldap.OPT_X_TLS_CACERTFILE, LDAP_CONFIG.tls_cacertfile)
+        # Build a fresh TLS context for this connection so the option above takes effect
+        conn.set_option(ldap.OPT_X_TLS_NEWCTX, 0)
+    if LDAP_CONFIG.start_tls and not ldap_server.startswith("ldaps://"):
+        # Pooled connections keep the TLS session, so the handshake is paid once per connection
+        conn.start_tls_s()
+    return conn
+
+def _close(conn) -> None:
+    """Unbind a connection, ignoring errors from connections that are already dead"""
+    try:
+        conn.unbind_s()
+    except Exception:
+        pass
+
+class LDAPConnectionPool:
+    """
+    Pool of admin-bound LDAP connections reused for user searches
+    
+    At most `size` connections are open at once; callers wait up to `timeout`
+    seconds for a free one instead of opening more during a login burst.
+    Connections are recycled after `lifetime` seconds, and a connection idle for
+    longer than `keepalive` seconds is checked with whoami_s() before reuse.
+    User credential binds never go through the pool, so pooled connections keep
+    the admin identity.
+    """
+    
+    def __init__(self, ldap_server: str, admin_dn: str, admin_password: str,
+                 size: int = LDAP_POOL_SIZE, lifetime: int = LDAP_POOL_LIFETIME,
+                 keepalive: int = LDAP_POOL_KEEPALIVE, timeout: float = LDAP_POOL_TIMEOUT):
+        self.ldap_server = ldap_server
+        self.admin_dn = admin_dn
+        self.admin_password = admin_password
+        self.lifetime = lifetime
+        self.keepalive = keepalive
+        self.timeout = timeout
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._slots = threading.BoundedSemaphore(size)
+    
+    def _connect(self):
+        conn = _initialize(self.ldap_server, reconnect=True)
+        conn.simple_bind_s(self.admin_dn, self.admin_password)
+        return conn, time.monotonic()
+    
+    def _acquire(self):
+        try:
+            conn, created, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        
+        now = time.monotonic()
+        if now - created > self.lifetime:
+            _close(conn)
+            return self._connect()
+        if now - last_used > self.keepalive:
+            try:
+                conn.whoami_s()
+            except ldap.LDAPError:
+                _close(conn)
+                return self._connect()
+        return conn, created
+    
+    @contextmanager
+    def connection(self):
+        """
+        Borrow an admin-bound connection, returning it to the pool afterwards
+        
+        Raises:
+            TimeoutError: If no connection becomes free within the pool timeout
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("Timed out waiting for a pooled LDAP connection")
+        try:
+            conn, created = self._acquire()
+            try:
+                yield conn
+            except BaseException:
+                # Any error (or GeneratorExit) may have left the connection mid-operation;
+                # close it rather than hand it to the next caller or leave it to the GC
+                _close(conn)
+                raise
+            try:
+                self._idle.put_nowait((conn, created, time.monotonic()))
+            except queue.Full:
+                _close(conn)
+        finally:
+            self._slots.release()
+    
+    def close(self) -> None:
+        """Unbind every idle connection"""
+        while True:
+            try:
+                conn, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close(conn)
+
+# One pool per worker process; created lazily so forked workers never share sockets
+_POOL: Optional[LDAPConnectionPool] = None
+_POOL_PID: Optional[int] = None
+_POOL_LOCK = threading.Lock()
+
+def get_ldap_pool(ldap_server: str, admin_dn: str, admin_password: str) -> LDAPConnectionPool:
+    """
+    Get the admin connection pool for the current process, creating it on first use
+    
+    Args:
+        ldap_server: LDAP server URL
+        admin_dn: DN used for the admin (search) bind
+        admin_password: Password for the admin bind
+        
+    Returns:
+        The process-wide LDAPConnectionPool
+    """
+    global _POOL, _POOL_PID
+    pid = os.getpid()
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != pid:
+            _POOL = LDAPConnectionPool(ldap_server, admin_dn, admin_password)
+            _POOL_PID = pid
+        return _POOL
+
+def authenticate_ldap(username: str, password: str) -> Tuple[Optional[bool], Dict]:
     """
     Authenticate a user using LDAP/Active Directory
     
@@ -25,71 +213,71 @@ def authenticate_ldap(username: str, password: str) -> Tuple[bool, Dict]:
         
     Returns:
         Tuple containing:
-            - Boolean indicating if authentication was successful
+            - True if authentication was successful, False if the credentials were
+              rejected, None if LDAP could not be queried (not a verdict)
             - Dict with user data if successful, empty dict otherwise
     """
     if not LDAP_AVAILABLE:
         logger.error("LDAP authentication requested but python-ldap module is not installed")
-        return False, {"error": "LDAP authentication is not available. Install python-ldap package."}
+        return None, {"error": "LDAP authentication is not available. Install python-ldap package."}
+    
+    if not isinstance(username, str) or len(username) > LDAP_MAX_USERNAME_LENGTH:
+        logger.warning("Rejected LDAP login with a non-string username or one longer than %d characters", LDAP_MAX_USERNAME_LENGTH)
+        return False, {}
     
     try:
-        # Get LDAP configuration from environment variables
-        ldap_server = os.getenv("LDAP_SERVER", "ldap://localhost:389")
-        ldap_base_dn = os.getenv("LDAP_BASE_DN", "dc=example,dc=com")
-        ldap_user_dn = os.getenv("LDAP_USER_DN", "cn=users,dc=example,dc=com")
-        ldap_admin_dn = os.getenv("LDAP_ADMIN_DN", "")
-        ldap_admin_password = os.getenv("LDAP_ADMIN_PASSWORD", "")
-        
-        # Initialize LDAP connection
-        conn = ldap.initialize(ldap_server)
-        conn.protocol_version = 3
-        conn.set_option(ldap.OPT_REFERRALS, 0)
+        config = LDAP_CONFIG
         
-        # Bind with admin credentials if provided (for user search)
-        if ldap_admin_dn and ldap_admin_password:
-            conn.simple_bind_s(ldap_admin_dn, ldap_admin_password)
-            
-            # Search for the user
-            search_filter = f"(sAMAccountName={username})"
-            result = conn.search_s(
-                ldap_user_dn, 
-                ldap.SCOPE_SUBTREE, 
-                search_filter, 
-                ['cn', 'mail', 'memberOf']
-            )
+        # Search for the user over a pooled admin connection if admin credentials are provided
+        if config.admin_dn and config.admin_password:
+            pool = get_ldap_pool(config.server, config.admin_dn, config.admin_password)
+            search_filter = _user_search_filter(username)
+            with pool.connection() as admin_conn:
+                result = admin_conn.search_s(
+                    config.user_dn, 
+                    ldap.SCOPE_SUBTREE, 
+                    search_filter, 
+                    ['cn', 'mail', 'memberOf']
+                )
             
             if not result:
-                logger.warning(f"User {username} not found in LDAP")
+                logger.warning("User %s not found in LDAP", username)
                 return False, {}
                 
             user_dn = result[0][0]
             user_data = result[0][1]
         else:
             # Construct the user DN directly if admin search is not available
-            user_dn = f"cn={username},{ldap_user_dn}"
+            user_dn = f"cn={ldap.dn.escape_dn_chars(username)},{config.user_dn}"
             user_data = {}
         
-        # Now try to bind with the user's credentials
-        conn.simple_bind_s(user_dn, password)
+        # Now try to bind with the user's credentials on a separate short-lived connection
+        conn = _initialize(config.server)
+        try:
+            conn.simple_bind_s(user_dn, password)
+        finally:
+            _close(conn)
         
         # Authentication successful
         # Extract relevant user info for JWT claims
         claims = {
             "sub": username,
-            "name": user_data.get('cn', [b''])[0].decode('utf-8') if 'cn' in user_data else username,
-            "email": user_data.get('mail', [b''])[0].decode('utf-8') if 'mail' in user_data else "",
-            "groups": [group.decode('utf-8') for group in user_data.get('memberOf', [])] if 'memberOf' in user_data else []
+            "name": _decode_first(user_data, 'cn', username),
+            "email": _decode_first(user_data, 'mail'),
+            "groups": list(map(_decode, user_data.get('memberOf', ())))
         }
         
-        conn.unbind_s()
         return True, claims
         
     except ldap.INVALID_CREDENTIALS:
-        logger.warning(f"Invalid credentials for user {username}")
+        logger.warning("Invalid credentials for user %s", username)
         return False, {}
     except ldap.LDAPError as e:
-        logger.error(f"LDAP error: {str(e)}")
-        return False, {}
+        logger.error("LDAP error: %s", e)
+        return None, {}
+    except TimeoutError as e:
+        logger.error("LDAP connection pool exhausted: %s", e)
+        return None, {}
     except Exception as e:
-        logger.error(f"Unexpected error during LDAP authentication: {str(e)}")
-        return False, {}
+        logger.error("Unexpected error during LDAP authentication: %s", e)
+        return None, {}
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Write the OpenAPI spec to disk at deploy time
+Lets a reverse proxy or CDN serve /swagger.json, /swagger.lean.json and /swagger.yaml
+as static files (with .gz siblings for gzip_static) without reaching the app
+"""
+
+import os
+import sys
+import gzip
+import argparse
+from swagger_config import get_swagger_files
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the OpenAPI spec files')
+    parser.add_argument('output_dir', nargs='?', default='static', help='Directory to write the spec files to')
+    parser.add_argument('--no-gzip', action='store_true', help='Skip writing precompressed .gz copies')
+    args = parser.parse_args()
+    
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for name, body in get_swagger_files().items():
+            path = os.path.join(args.output_dir, name)
+            with open(path, 'wb') as f:
+                f.write(body)
+            if not args.no_gzip:
+                with open(path + '.gz', 'wb') as f:
+                    f.write(gzip.compress(body, compresslevel=9, mtime=0))
+            print(f"Wrote {path} ({len(body)} bytes)")
+    except OSError as e:
+        print(f"Error writing spec files to {args.output_dir}: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,19 @@
 import logging
+from types import MappingProxyType
 from typing import Dict, Any, List
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Mock implementation - in production this would be based on the API key's subscription level.
+# Each entry is (available models, is_restricted), with is_restricted precomputed.
+_MODELS_BY_KEY = MappingProxyType({
+    "groq-service": (("llama3-70b", "llama3-8b", "mixtral-8x7b"), False),
+    "openai-service": (("gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"), False),
+    "full-access": (("gpt-4", "llama3-70b", "claude-3-opus", "claude-3-sonnet"), False)
+})
+# Default set for API keys not listed above
+_DEFAULT_MODELS = (("gpt-3.5-turbo",), True)
+
 def check_model_access(api_key_id: str, **kwargs) -> Dict[str, Any]:
     """
     Check which models the API key has access to
@@ -16,22 +25,15 @@ def check_model_access(api_key_id: str, **kwargs) -> Dict[str, Any]:
     Returns:
         Dict containing the model access information
     """
-    logger.info(f"Checking model access for API key: {api_key_id}")
+    logger.info("Checking model access for API key: %s", api_key_id)
     
     # In a real implementation, this would query a database or external service
     # For demonstration, we'll return a mock response
     
-    # Mock implementation - in production this would be based on the API key's subscription level
-    models_by_key = {
-        "groq-service": ["llama3-70b", "llama3-8b", "mixtral-8x7b"],
-        "openai-service": ["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"],
-        "full-access": ["gpt-4", "llama3-70b", "claude-3-opus", "claude-3-sonnet"]
-    }
-    
     # Get the models for this API key, or return a default set if not found
-    available_models = models_by_key.get(api_key_id, ["gpt-3.5-turbo"])
+    available_models, is_restricted = _MODELS_BY_KEY.get(api_key_id, _DEFAULT_MODELS)
     
     return {
-        "available_models": available_models,
-        "is_restricted": len(available_models) < 3  # Example logic
+        "available_models": list(available_models),
+        "is_restricted": is_restricted
     }
@@ -1,9 +1,64 @@
 import logging
+import threading
+from collections import namedtuple
 from typing import List, Dict, Any
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Preprocessed category index per categories dict, keyed by id(categories).
+# The categories dict itself is kept so its id can't be reused while cached, and is compared
+# by identity on lookup. API key metadata comes from the mtime-cached registry, so the same
+# dict is passed on every call until the file changes.
+_CategoryIndex = namedtuple("_CategoryIndex", ["categories", "entries", "tier_rank", "group_index"])
+
+_CATEGORY_CACHE_SIZE = 64
+_CATEGORY_CACHE: Dict[int, _CategoryIndex] = {}
+_CATEGORY_CACHE_LOCK = threading.Lock()
+
+def _index_categories(categories: Dict[str, Any]) -> _CategoryIndex:
+    """
+    Build (or reuse) the lookup index for a categories dict
+    
+    Args:
+        categories: Mapping of category name to category data with 'groups' and optional 'tier'
+        
+    Returns:
+        _CategoryIndex with:
+            - entries: (name, category data) pairs in definition order
+            - tier_rank: position of each entry when sorted by descending tier (ties keep definition order)
+            - group_index: inverted index of group name to the entry positions that list it
+    """
+    key = id(categories)
+    with _CATEGORY_CACHE_LOCK:
+        cached = _CATEGORY_CACHE.get(key)
+        if cached is not None and cached.categories is categories:
+            return cached
+    
+    entries = tuple(categories.items())
+    tiered = sorted(range(len(entries)), key=lambda i: entries[i][1].get('tier', 0), reverse=True)
+    tier_rank = [0] * len(entries)
+    for rank, position in enumerate(tiered):
+        tier_rank[position] = rank
+    
+    group_index: Dict[str, List[int]] = {}
+    for position, (_, cat_data) in enumerate(entries):
+        for group in frozenset(cat_data.get('groups', ())):
+            group_index.setdefault(group, []).append(position)
+    
+    index = _CategoryIndex(
+        categories,
+        entries,
+        tuple(tier_rank),
+        {group: tuple(positions) for group, positions in group_index.items()}
+    )
+    
+    with _CATEGORY_CACHE_LOCK:
+        if len(_CATEGORY_CACHE) >= _CATEGORY_CACHE_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            del _CATEGORY_CACHE[next(iter(_CATEGORY_CACHE))]
+        _CATEGORY_CACHE[key] = index
+    return index
+
 def get_user_category(user_groups: List[str], lookup_mode: str = 'FIRST_MATCH', **kwargs) -> Dict[str, Any]:
     """
     Assign user to a category based on group membership and lookup mode.
@@ -15,34 +70,35 @@ def get_user_category(user_groups: List[str], lookup_mode: str = 'FIRST_MATCH',
     Returns:
         Dict with category assignment result
     """
-    logger.info(f"Assigning user category for groups: {user_groups} with mode: {lookup_mode}")
+    logger.info("Assigning user category for groups: %s with mode: %s", user_groups, lookup_mode)
     metadata = kwargs.get('metadata', {})
     categories = metadata.get('categories', {})
     if not categories:
         logger.warning("No categories found in metadata")
         return {"categories": [], "match_mode": lookup_mode, "reason": "No categories in metadata"}
 
-    matches = []
-    for cat_name, cat_data in categories.items():
-        cat_groups = cat_data.get('groups', [])
-        # If any group matches, consider this category
-        if any(g in user_groups for g in cat_groups):
-            matches.append({"name": cat_name, **cat_data})
-
-    if lookup_mode == 'FIRST_MATCH':
-        if matches:
-            return {"category": matches[0], "match_mode": lookup_mode}
-        else:
+    index = _index_categories(categories)
+    # Only visit categories that list one of the user's groups, via the inverted index
+    group_index = index.group_index
+    matched = set()
+    for group in frozenset(user_groups or ()):
+        positions = group_index.get(group)
+        if positions:
+            matched.update(positions)
+    
+    if lookup_mode in ('FIRST_MATCH', 'TIERED_MATCH'):
+        if not matched:
             return {"category": None, "match_mode": lookup_mode, "reason": "No match"}
-    elif lookup_mode == 'ALL_MATCHES':
+        # TIERED_MATCH assumes each category has a 'tier' field for ranking (higher is better)
+        best = min(matched) if lookup_mode == 'FIRST_MATCH' else min(matched, key=index.tier_rank.__getitem__)
+        cat_name, cat_data = index.entries[best]
+        return {"category": {"name": cat_name, **cat_data}, "match_mode": lookup_mode}
+    
+    # If any group matches, consider this category (in definition order)
+    matches = [{"name": index.entries[i][0], **index.entries[i][1]} for i in sorted(matched)]
+    
+    if lookup_mode == 'ALL_MATCHES':
         return {"categories": matches, "match_mode": lookup_mode}
-    elif lookup_mode == 'TIERED_MATCH':
-        # Assume each category has a 'tier' field for ranking (higher is better)
-        if matches:
-            best = max(matches, key=lambda x: x.get('tier', 0))
-            return {"category": best, "match_mode": lookup_mode}
-        else:
-            return {"category": None, "match_mode": lookup_mode, "reason": "No match"}
     else:
-        logger.warning(f"Unknown lookup_mode: {lookup_mode}")
+        logger.warning("Unknown lookup_mode: %s", lookup_mode)
         return {"categories": matches, "match_mode": lookup_mode, "reason": "Unknown lookup_mode"}
@@ -1,10 +1,42 @@
 import logging
+from types import MappingProxyType
 from typing import Dict, Any, List
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared empty mapping for calls without metadata
+_EMPTY = MappingProxyType({})
+
+# Fallback mock permissions, used when the API key metadata has no team_permissions
+_TEAM_PERMISSIONS = MappingProxyType({
+    "admin-team": MappingProxyType({
+        "can_manage_users": True,
+        "can_create_api_keys": True,
+        "can_view_billing": True,
+        "max_models_per_request": 5
+    }),
+    "ai-team": MappingProxyType({
+        "can_manage_users": False,
+        "can_create_api_keys": False,
+        "can_view_billing": False,
+        "max_models_per_request": 3
+    }),
+    "ml-team": MappingProxyType({
+        "can_manage_users": False,
+        "can_create_api_keys": False,
+        "can_view_billing": False,
+        "max_models_per_request": 2
+    })
+})
+
+# Permissions for teams not found in the table
+_DEFAULT_TEAM_PERMS = MappingProxyType({
+    "can_manage_users": False,
+    "can_create_api_keys": False,
+    "can_view_billing": False,
+    "max_models_per_request": 1
+})
+
 def get_team_permissions(team_id: str, api_key_id: str, **kwargs) -> Dict[str, Any]:
     """
     Get permissions for a team
@@ -17,38 +49,14 @@ def get_team_permissions(team_id: str, api_key_id: str, **kwargs) -> Dict[str, A
     Returns:
         Dict containing the team permissions
     """
-    logger.info(f"Getting permissions for team: {team_id} with API key: {api_key_id}")
-    metadata = kwargs.get('metadata', {}) if 'metadata' in kwargs else {}
+    logger.info("Getting permissions for team: %s with API key: %s", team_id, api_key_id)
+    metadata = kwargs.get('metadata') or _EMPTY
     
-    # Prefer team_permissions from metadata if present
+    # Prefer team_permissions from metadata if present, else fall back to the hardcoded mock
     team_permissions = metadata.get('team_permissions')
     if team_permissions is None:
-        # Fallback to hardcoded mock
-        team_permissions = {
-        "admin-team": {
-            "can_manage_users": True,
-            "can_create_api_keys": True,
-            "can_view_billing": True,
-            "max_models_per_request": 5
-        },
-        "ai-team": {
-            "can_manage_users": False,
-            "can_create_api_keys": False,
-            "can_view_billing": False,
-            "max_models_per_request": 3
-        },
-        "ml-team": {
-            "can_manage_users": False,
-            "can_create_api_keys": False,
-            "can_view_billing": False,
-            "max_models_per_request": 2
-        }
-    }
+        team_permissions = _TEAM_PERMISSIONS
     
-    # Return permissions for the team, or a default set if not found
-    return team_permissions.get(team_id, {
-        "can_manage_users": False,
-        "can_create_api_keys": False,
-        "can_view_billing": False,
-        "max_models_per_request": 1
-    })
+    # Return a copy of the permissions for the team, or a default set if not found.
+    # Copied because the claim is JSON-encoded and the tables are shared.
+    return dict(team_permissions.get(team_id, _DEFAULT_TEAM_PERMS))
@@ -1,10 +1,15 @@
 import logging
+from types import MappingProxyType
 from typing import Dict, Any
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Mock quota returned for every user
+_MOCK_QUOTA = MappingProxyType({
+    "remaining_tokens": 10000,  # Example value
+    "reset_date": "2025-06-01"
+})
+
 def get_remaining_quota(user_id: str, **kwargs) -> Dict[str, Any]:
     """
     Get the remaining quota for a user
@@ -16,7 +21,7 @@ def get_remaining_quota(user_id: str, **kwargs) -> Dict[str, Any]:
     Returns:
         Dict containing the remaining quota information
     """
-    logger.info(f"Getting quota for user: {user_id}")
+    logger.info("Getting quota for user: %s", user_id)
     
     # In a real implementation, this would query a database or external service
     # For demonstration, we'll return a mock response
@@ -26,10 +31,5 @@ def get_remaining_quota(user_id: str, **kwargs) -> Dict[str, Any]:
     # result = db.execute("SELECT remaining_tokens FROM user_quotas WHERE user_id = %s", (user_id,))
     # remaining_tokens = result.fetchone()['remaining_tokens']
     
-    # Mock implementation
-    remaining_tokens = 10000  # Example value
-    
-    return {
-        "remaining_tokens": remaining_tokens,
-        "reset_date": "2025-06-01"
-    }
+    # Mock implementation (copied because the claim is JSON-encoded)
+    return dict(_MOCK_QUOTA)
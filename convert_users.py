@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Convert the users YAML file to JSON for faster loading
+File-based authentication prefers users.json next to users.yaml when it is at least as new
+"""
+
+import os
+import sys
+import argparse
+import orjson
+import yaml
+from dotenv import load_dotenv
+
+# Prefer the libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+
+# Load environment variables
+load_dotenv()
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert users YAML file to JSON')
+    parser.add_argument('users_file', nargs='?', default=os.getenv('USERS_FILE', 'config/users.yaml'), help='Users YAML file')
+    parser.add_argument('--output', help='Output JSON file (default: same path with .json extension)')
+    args = parser.parse_args()
+    
+    output = args.output or os.path.splitext(args.users_file)[0] + '.json'
+    
+    try:
+        with open(args.users_file, 'r') as f:
+            users = yaml.load(f, Loader=CSafeLoader) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"Error reading {args.users_file}: {e}")
+        sys.exit(1)
+    
+    if not isinstance(users, dict):
+        print(f"Error: {args.users_file} does not contain a mapping of users")
+        sys.exit(1)
+    
+    with open(output, 'wb') as f:
+        f.write(orjson.dumps(users, option=orjson.OPT_INDENT_2))
+    
+    print(f"Wrote {len(users)} users to {output}")
+
+if __name__ == '__main__':
+    main()
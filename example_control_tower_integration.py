@@ -5,19 +5,27 @@ Demonstrates how to use api_key_config payload with Control Tower manifests
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
+from requests.adapters import HTTPAdapter
 
 # Service URLs
 CONTROL_TOWER_URL = "http://localhost:8000"
 JWT_SERVICE_URL = "http://localhost:5000"
 FRONT_DOOR_URL = "http://localhost:9000"
 
+# Shared session so requests to each service reuse keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
 
 def get_manifest_from_control_tower(project_id: str) -> Dict[str, Any]:
     """
     Fetch a project manifest from Control Tower
     """
-    response = requests.get(f"{CONTROL_TOWER_URL}/manifests/{project_id}")
+    response = _SESSION.get(f"{CONTROL_TOWER_URL}/manifests/{project_id}")
     response.raise_for_status()
     return response.json()
 
@@ -26,14 +34,11 @@ def extract_jwt_config_from_manifest(manifest: Dict[str, Any]) -> Dict[str, Any]
     """
     Extract JWT configuration from a Control Tower manifest
     """
-    modules = manifest.get("modules", [])
-    
-    # Find the JWT module
-    for module in modules:
-        if module.get("type") == "jwt_config":
-            return module.get("config", {})
-    
-    return {}
+    # Find the first JWT module
+    return next(
+        (module.get("config", {}) for module in manifest.get("modules", ()) if module.get("type") == "jwt_config"),
+        {}
+    )
 
 
 def get_jwt_token_with_manifest_config(
@@ -65,7 +70,7 @@ def get_jwt_token_with_manifest_config(
     
     # Step 3: Use the JWT config as api_key_config payload
     print("Requesting JWT token with manifest configuration")
-    response = requests.post(
+    response = _SESSION.post(
         f"{JWT_SERVICE_URL}/token",
         json={
             "username": username,
@@ -88,7 +93,7 @@ def example_sas2py_project():
     
     try:
         # Use Front Door endpoint: /{project_id}/{jwt_module_name}/token
-        response = requests.post(
+        response = _SESSION.post(
             f"{FRONT_DOOR_URL}/sas2py/simple-auth/token",
             json={
                 "username": "admin",
@@ -107,7 +112,7 @@ def example_sas2py_project():
         print(f"Access Token: {token_data['access_token'][:50]}...")
         
         # Decode token to see claims
-        decode_response = requests.post(
+        decode_response = _SESSION.post(
             f"{JWT_SERVICE_URL}/decode",
             json={"token": token_data["access_token"]}
         )
@@ -162,7 +167,7 @@ def example_inline_config_without_control_tower():
     }
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             f"{JWT_SERVICE_URL}/token",
             json={
                 "username": "user1",
@@ -177,7 +182,7 @@ def example_inline_config_without_control_tower():
         print("\n✓ Successfully obtained JWT token")
         
         # Decode token
-        decode_response = requests.post(
+        decode_response = _SESSION.post(
             f"{JWT_SERVICE_URL}/decode",
             json={"token": token_data["access_token"]}
         )
@@ -205,7 +210,7 @@ def example_use_token_with_front_door(token: str):
     
     try:
         # Make a request to Front Door with the JWT token
-        response = requests.post(
+        response = _SESSION.post(
             f"{FRONT_DOOR_URL}/openai/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {token}",
@@ -233,6 +238,45 @@ def example_use_token_with_front_door(token: str):
         print(f"\n✗ Error: {e}")
 
 
+def _issue_tenant_token(tenant):
+    """
+    Request a token for one tenant with a tenant-specific inline configuration
+    
+    Returns:
+        Tuple of (response, None) on success or (None, error) if the request failed
+    """
+    tenant_id, tenant_info = tenant
+    
+    # Generate tenant-specific configuration
+    api_key_config = {
+        "id": f"tenant-{tenant_id}",
+        "owner": tenant_info["name"],
+        "claims": {
+            "static": {
+                "key": f"tenant-{tenant_id}-key",
+                "tenant_id": tenant_id,
+                "tier": tenant_info["tier"],
+                "models": tenant_info["models"],
+                "rate_limit": tenant_info["rate_limit"],
+                "project": f"tenant-{tenant_id}-project"
+            }
+        }
+    }
+    
+    try:
+        response = _SESSION.post(
+            f"{JWT_SERVICE_URL}/token",
+            json={
+                "username": "user1",
+                "password": "password123",
+                "api_key_config": api_key_config
+            }
+        )
+        return response, None
+    except requests.exceptions.RequestException as e:
+        return None, e
+
+
 def example_dynamic_multi_tenant():
     """
     Example: Multi-tenant application with dynamic configurations
@@ -257,46 +301,24 @@ def example_dynamic_multi_tenant():
         }
     }
     
-    for tenant_id, tenant_info in tenants.items():
+    # Issue all tenant tokens concurrently; the cost is network round-trips, not CPU
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(_issue_tenant_token, tenants.items()))
+    
+    # Report in tenant order (executor.map preserves input order)
+    for (tenant_id, tenant_info), (response, error) in zip(tenants.items(), results):
         print(f"\n--- Tenant: {tenant_info['name']} ({tenant_id}) ---")
         
-        # Generate tenant-specific configuration
-        api_key_config = {
-            "id": f"tenant-{tenant_id}",
-            "owner": tenant_info["name"],
-            "claims": {
-                "static": {
-                    "key": f"tenant-{tenant_id}-key",
-                    "tenant_id": tenant_id,
-                    "tier": tenant_info["tier"],
-                    "models": tenant_info["models"],
-                    "rate_limit": tenant_info["rate_limit"],
-                    "project": f"tenant-{tenant_id}-project"
-                }
-            }
-        }
-        
-        try:
-            response = requests.post(
-                f"{JWT_SERVICE_URL}/token",
-                json={
-                    "username": "user1",
-                    "password": "password123",
-                    "api_key_config": api_key_config
-                }
-            )
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                print(f"✓ Token generated for {tenant_info['name']}")
-                print(f"  Tier: {tenant_info['tier']}")
-                print(f"  Rate Limit: {tenant_info['rate_limit']}")
-                print(f"  Models: {', '.join(tenant_info['models'])}")
-            else:
-                print(f"✗ Failed to generate token: {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Error: {e}")
+        if error is not None:
+            print(f"✗ Error: {error}")
+        elif response.status_code == 200:
+            token_data = response.json()
+            print(f"✓ Token generated for {tenant_info['name']}")
+            print(f"  Tier: {tenant_info['tier']}")
+            print(f"  Rate Limit: {tenant_info['rate_limit']}")
+            print(f"  Models: {', '.join(tenant_info['models'])}")
+        else:
+            print(f"✗ Failed to generate token: {response.status_code}")
 
 
 if __name__ == "__main__":
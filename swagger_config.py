@@ -3,101 +3,57 @@ Swagger API documentation configuration module for the JWT Auth application.
 Provides a centralized location for API specifications and documentation.
 """
 
-from apispec import APISpec
-from apispec.ext.marshmallow import MarshmallowPlugin
-from flask import Flask, jsonify
+from flask import Response, request
+import gzip
+import hashlib
+import logging
+from functools import lru_cache
+import orjson
 import yaml
 
-# Create an APISpec
-spec = APISpec(
-    title="JWT Auth API",
-    version="1.0.0",
-    openapi_version="3.0.2",
-    plugins=[MarshmallowPlugin()],
-    info={
-        "description": "API for JWT authentication, JWE encryption, and API key management. Supports symmetric encryption of JWT tokens using JWE (JSON Web Encryption) for enhanced security.",
-        "contact": {"email": "support@dspai.com"}
-    },
-    servers=[
-        {"url": "http://localhost:5000", "description": "Development server"}
-    ],
-    tags=[
-        {"name": "auth", "description": "Authentication endpoints"},
-        {"name": "token", "description": "Token management endpoints"},
-        {"name": "jwe", "description": "JWE (JSON Web Encryption) endpoints"},
-        {"name": "api-keys", "description": "API key management endpoints"},
-    ],
-)
+logger = logging.getLogger(__name__)
 
-# Define security schemes
-spec.components.security_scheme(
-    "bearerAuth", 
-    {
-        "type": "http",
-        "scheme": "bearer",
-        "bearerFormat": "JWT"
-    }
-)
+# Try to import brotli, but make it optional; gzip is always available
+BROTLI_AVAILABLE = False
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    logger.debug("brotli not installed, serving the API spec with gzip only (pip install brotli)")
 
-# Access Token Response Schema
-spec.components.schema(
-    "TokenResponse", 
-    {
-        "type": "object",
-        "properties": {
-            "access_token": {"type": "string"},
-            "refresh_token": {"type": "string"}
-        }
-    }
-)
+# Prefer the libyaml-backed dumper when available
+try:
+    from yaml import CSafeDumper
+except ImportError:
+    from yaml import SafeDumper as CSafeDumper
 
-# API Key Schema
-spec.components.schema(
-    "ApiKey", 
-    {
-        "type": "object",
-        "properties": {
-            "id": {"type": "string"},
-            "owner": {"type": "string"},
-            "provider_permissions": {
-                "type": "array",
-                "items": {"type": "string"}
-            },
-            "endpoint_permissions": {
-                "type": "array",
-                "items": {"type": "string"}
-            },
-            "claims": {
-                "type": "object",
-                "properties": {
-                    "static": {"type": "object"},
-                    "dynamic": {"type": "object"}
-                }
-            }
-        }
-    }
-)
 
-# API Key Creation Schema
-spec.components.schema(
-    "ApiKeyCreation", 
-    {
-        "type": "object",
-        "required": ["owner"],
-        "properties": {
-            "owner": {"type": "string"},
-            "provider_permissions": {
-                "type": "array",
-                "items": {"type": "string"}
-            },
-            "endpoint_permissions": {
-                "type": "array",
-                "items": {"type": "string"}
-            },
-            "static_claims": {"type": "object"}
-        }
-    }
-)
+class _SpecDumper(CSafeDumper):
+    """Safe dumper that writes shared sub-dictionaries out in full instead of as &id/* aliases"""
+    
+    def ignore_aliases(self, data):
+        return True
+
+
+# Static lists in the spec (e.g. "required") are tuples; emit them as plain YAML sequences
+_SpecDumper.add_representer(tuple, _SpecDumper.represent_list)
+
+
+# Fragments repeated across endpoints, shared by reference (treat as read-only)
+_STRING = {"type": "string"}
+_BOOLEAN = {"type": "boolean"}
+_STRING_ARRAY = {"type": "array", "items": _STRING}
+_BEARER_SECURITY = [{"bearerAuth": []}]
+_API_KEY_REF = {"$ref": "#/components/schemas/ApiKey"}
+
+# Shared error responses and parameters (defined under components below)
+_BAD_REQUEST = {"$ref": "#/components/responses/BadRequest"}
+_UNAUTHORIZED = {"$ref": "#/components/responses/Unauthorized"}
+_FORBIDDEN = {"$ref": "#/components/responses/Forbidden"}
+_API_KEY_NOT_FOUND = {"$ref": "#/components/responses/ApiKeyNotFound"}
+_API_KEY_STRING_PARAM = {"$ref": "#/components/parameters/ApiKeyString"}
+
+# Endpoint definitions are plain OpenAPI literals, assembled into _SPEC_DICT below
 
 # Define the token login endpoint
 login_endpoint = {
@@ -111,39 +67,12 @@ login_endpoint = {
                 "application/json": {
                     "schema": {
                         "type": "object",
-                        "required": ["username", "password"],
+                        "required": ("username", "password"),
                         "properties": {
                             "username": {"type": "string", "description": "Username for authentication"},
                             "password": {"type": "string", "description": "Password for authentication"},
                             "api_key": {"type": "string", "description": "API key string to look up configuration from file"},
-                            "api_key_config": {
-                                "type": "object",
-                                "description": "Inline API key configuration (takes precedence over api_key)",
-                                "properties": {
-                                    "id": {"type": "string"},
-                                    "owner": {"type": "string"},
-                                    "claims": {
-                                        "type": "object",
-                                        "properties": {
-                                            "static": {
-                                                "type": "object",
-                                                "description": "Static claims to include in JWT",
-                                                "additionalProperties": True
-                                            },
-                                            "dynamic": {
-                                                "type": "object",
-                                                "description": "Dynamic claims configuration",
-                                                "additionalProperties": True
-                                            }
-                                        }
-                                    },
-                                    "metadata": {
-                                        "type": "object",
-                                        "description": "Metadata not included in JWT but used for function calls",
-                                        "additionalProperties": True
-                                    }
-                                }
-                            },
+                            "api_key_config": {"$ref": "#/components/schemas/ApiKeyConfigInline"},
                             "secret": {"type": "string", "description": "Custom secret for token generation"}
                         }
                     },
@@ -189,8 +118,8 @@ login_endpoint = {
                     }
                 }
             },
-            "400": {"description": "Invalid request"},
-            "401": {"description": "Authentication failed"}
+            "400": _BAD_REQUEST,
+            "401": _UNAUTHORIZED
         }
     }
 }
@@ -201,7 +130,7 @@ refresh_endpoint = {
         "tags": ["token"],
         "summary": "Refresh access token",
         "description": "Get a new access token using a refresh token",
-        "security": [{"bearerAuth": []}],
+        "security": _BEARER_SECURITY,
         "responses": {
             "200": {
                 "description": "New access token",
@@ -210,7 +139,7 @@ refresh_endpoint = {
                         "schema": {
                             "type": "object",
                             "properties": {
-                                "access_token": {"type": "string"}
+                                "access_token": _STRING
                             }
                         }
                     }
@@ -233,9 +162,9 @@ decode_endpoint = {
                 "application/json": {
                     "schema": {
                         "type": "object",
-                        "required": ["token"],
+                        "required": ("token",),
                         "properties": {
-                            "token": {"type": "string"}
+                            "token": _STRING
                         }
                     }
                 }
@@ -269,9 +198,9 @@ validate_endpoint = {
                 "application/json": {
                     "schema": {
                         "type": "object",
-                        "required": ["token"],
+                        "required": ("token",),
                         "properties": {
-                            "token": {"type": "string"}
+                            "token": _STRING
                         }
                     }
                 }
@@ -285,14 +214,14 @@ validate_endpoint = {
                         "schema": {
                             "type": "object",
                             "properties": {
-                                "valid": {"type": "boolean"},
-                                "signature_verified": {"type": "boolean"},
-                                "expired": {"type": "boolean"},
-                                "expiry_time": {"type": "string"},
-                                "issued_at": {"type": "string"},
-                                "issuer": {"type": "string"},
-                                "subject": {"type": "string"},
-                                "error": {"type": "string"}
+                                "valid": _BOOLEAN,
+                                "signature_verified": _BOOLEAN,
+                                "expired": _BOOLEAN,
+                                "expiry_time": _STRING,
+                                "issued_at": _STRING,
+                                "issuer": _STRING,
+                                "subject": _STRING,
+                                "error": _STRING
                             }
                         }
                     }
@@ -309,7 +238,7 @@ protected_endpoint = {
         "tags": ["auth"],
         "summary": "Protected endpoint",
         "description": "Test endpoint that requires a valid JWT token",
-        "security": [{"bearerAuth": []}],
+        "security": _BEARER_SECURITY,
         "responses": {
             "200": {
                 "description": "Successfully authenticated",
@@ -318,13 +247,13 @@ protected_endpoint = {
                         "schema": {
                             "type": "object",
                             "properties": {
-                                "logged_in_as": {"type": "string"}
+                                "logged_in_as": _STRING
                             }
                         }
                     }
                 }
             },
-            "401": {"description": "Authentication failed"}
+            "401": _UNAUTHORIZED
         }
     }
 }
@@ -335,7 +264,7 @@ sensitive_action_endpoint = {
         "tags": ["auth"],
         "summary": "Sensitive action endpoint",
         "description": "Test endpoint that requires a fresh JWT token (from direct login)",
-        "security": [{"bearerAuth": []}],
+        "security": _BEARER_SECURITY,
         "responses": {
             "200": {
                 "description": "Sensitive action performed",
@@ -344,11 +273,11 @@ sensitive_action_endpoint = {
                         "schema": {
                             "type": "object",
                             "properties": {
-                                "message": {"type": "string"},
-                                "user": {"type": "string"},
-                                "token_status": {"type": "string"},
-                                "token_freshness": {"type": "boolean"},
-                                "action_time": {"type": "string"}
+                                "message": _STRING,
+                                "user": _STRING,
+                                "token_status": _STRING,
+                                "token_freshness": _BOOLEAN,
+                                "action_time": _STRING
                             }
                         }
                     }
@@ -365,7 +294,7 @@ get_api_keys_endpoint = {
         "tags": ["api-keys"],
         "summary": "Get all API keys",
         "description": "Get a list of all API keys (admin only)",
-        "security": [{"bearerAuth": []}],
+        "security": _BEARER_SECURITY,
         "responses": {
             "200": {
                 "description": "List of API keys",
@@ -373,13 +302,13 @@ get_api_keys_endpoint = {
                     "application/json": {
                         "schema": {
                             "type": "array",
-                            "items": {"$ref": "#/components/schemas/ApiKey"}
+                            "items": _API_KEY_REF
                         }
                     }
                 }
             },
-            "401": {"description": "Authentication failed"},
-            "403": {"description": "Not authorized (admin only)"}
+            "401": _UNAUTHORIZED,
+            "403": _FORBIDDEN
         }
     }
 }
@@ -390,13 +319,13 @@ get_api_key_endpoint = {
         "tags": ["api-keys"],
         "summary": "Get API key details",
         "description": "Get details for a specific API key (admin only)",
-        "security": [{"bearerAuth": []}],
+        "security": _BEARER_SECURITY,
         "parameters": [
             {
                 "name": "api_key_id",
                 "in": "path",
                 "required": True,
-                "schema": {"type": "string"},
+                "schema": _STRING,
                 "description": "API key ID"
             }
         ],
@@ -405,13 +334,13 @@ get_api_key_endpoint = {
                 "description": "API key details",
                 "content": {
                     "application/json": {
-                        "schema": {"$ref": "#/components/schemas/ApiKey"}
+                        "schema": _API_KEY_REF
                     }
                 }
             },
-            "401": {"description": "Authentication failed"},
-            "403": {"description": "Not authorized (admin only)"},
-            "404": {"description": "API key not found"}
+            "401": _UNAUTHORIZED,
+            "403": _FORBIDDEN,
+            "404": _API_KEY_NOT_FOUND
         }
     }
 }
@@ -422,7 +351,7 @@ create_api_key_endpoint = {
         "tags": ["api-keys"],
         "summary": "Create a new API key",
         "description": "Create a new API key with specified permissions (admin only)",
-        "security": [{"bearerAuth": []}],
+        "security": _BEARER_SECURITY,
         "requestBody": {
             "required": True,
             "content": {
@@ -438,11 +367,11 @@ create_api_key_endpoint = {
                     "application/json": {
                         "schema": {
                             "allOf": [
-                                {"$ref": "#/components/schemas/ApiKey"},
+                                _API_KEY_REF,
                                 {
                                     "type": "object",
                                     "properties": {
-                                        "api_key": {"type": "string"}
+                                        "api_key": _STRING
                                     }
                                 }
                             ]
@@ -450,9 +379,9 @@ create_api_key_endpoint = {
                     }
                 }
             },
-            "400": {"description": "Invalid request"},
-            "401": {"description": "Authentication failed"},
-            "403": {"description": "Not authorized (admin only)"}
+            "400": _BAD_REQUEST,
+            "401": _UNAUTHORIZED,
+            "403": _FORBIDDEN
         }
     }
 }
@@ -463,16 +392,8 @@ update_api_key_endpoint = {
         "tags": ["api-keys"],
         "summary": "Update an API key",
         "description": "Update an existing API key (admin only)",
-        "security": [{"bearerAuth": []}],
-        "parameters": [
-            {
-                "name": "api_key_string",
-                "in": "path",
-                "required": True,
-                "schema": {"type": "string"},
-                "description": "API key string"
-            }
-        ],
+        "security": _BEARER_SECURITY,
+        "parameters": [_API_KEY_STRING_PARAM],
         "requestBody": {
             "required": True,
             "content": {
@@ -486,14 +407,14 @@ update_api_key_endpoint = {
                 "description": "API key updated",
                 "content": {
                     "application/json": {
-                        "schema": {"$ref": "#/components/schemas/ApiKey"}
+                        "schema": _API_KEY_REF
                     }
                 }
             },
-            "400": {"description": "Invalid request"},
-            "401": {"description": "Authentication failed"},
-            "403": {"description": "Not authorized (admin only)"},
-            "404": {"description": "API key not found"}
+            "400": _BAD_REQUEST,
+            "401": _UNAUTHORIZED,
+            "403": _FORBIDDEN,
+            "404": _API_KEY_NOT_FOUND
         }
     }
 }
@@ -504,16 +425,8 @@ delete_api_key_endpoint = {
         "tags": ["api-keys"],
         "summary": "Delete an API key",
         "description": "Delete an existing API key (admin only)",
-        "security": [{"bearerAuth": []}],
-        "parameters": [
-            {
-                "name": "api_key_string",
-                "in": "path",
-                "required": True,
-                "schema": {"type": "string"},
-                "description": "API key string"
-            }
-        ],
+        "security": _BEARER_SECURITY,
+        "parameters": [_API_KEY_STRING_PARAM],
         "responses": {
             "200": {
                 "description": "API key deleted",
@@ -522,15 +435,15 @@ delete_api_key_endpoint = {
                         "schema": {
                             "type": "object",
                             "properties": {
-                                "message": {"type": "string"}
+                                "message": _STRING
                             }
                         }
                     }
                 }
             },
-            "401": {"description": "Authentication failed"},
-            "403": {"description": "Not authorized (admin only)"},
-            "404": {"description": "API key not found"}
+            "401": _UNAUTHORIZED,
+            "403": _FORBIDDEN,
+            "404": _API_KEY_NOT_FOUND
         }
     }
 }
@@ -609,7 +522,7 @@ encrypt_jwe_endpoint = {
                 "application/json": {
                     "schema": {
                         "type": "object",
-                        "required": ["encryption_key"],
+                        "required": ("encryption_key",),
                         "properties": {
                             "token": {
                                 "type": "string",
@@ -634,6 +547,11 @@ encrypt_jwe_endpoint = {
                                 "enum": [None, "DEF"],
                                 "nullable": True,
                                 "description": "Compression algorithm (null or DEF for deflate)"
+                            },
+                            "return_digest": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Also return plaintext_sha256: SHA-256 of the token, or of the payload as compact JSON with sorted keys"
                             }
                         }
                     },
@@ -669,6 +587,7 @@ encrypt_jwe_endpoint = {
                             "properties": {
                                 "jwe_token": {"type": "string", "description": "JWE encrypted token"},
                                 "encryption": {"type": "string", "description": "Encryption algorithm used"},
+                                "plaintext_sha256": {"type": "string", "description": "Hex SHA-256 of the plaintext (only with return_digest)"},
                                 "compression": {"type": "string", "nullable": True, "description": "Compression used"}
                             }
                         }
@@ -692,7 +611,7 @@ decrypt_jwe_endpoint = {
                 "application/json": {
                     "schema": {
                         "type": "object",
-                        "required": ["jwe_token", "encryption_key"],
+                        "required": ("jwe_token", "encryption_key"),
                         "properties": {
                             "jwe_token": {
                                 "type": "string",
@@ -768,28 +687,290 @@ decrypt_jwe_endpoint = {
     }
 }
 
-# Add paths to spec
-spec.path(path="/token", operations=login_endpoint)
-spec.path(path="/refresh", operations=refresh_endpoint)
-spec.path(path="/decode", operations=decode_endpoint)
-spec.path(path="/validate", operations=validate_endpoint)
-spec.path(path="/protected", operations=protected_endpoint)
-spec.path(path="/sensitive-action", operations=sensitive_action_endpoint)
-spec.path(path="/generate-jwe-key", operations=generate_jwe_key_endpoint)
-spec.path(path="/encrypt-jwe", operations=encrypt_jwe_endpoint)
-spec.path(path="/decrypt-jwe", operations=decrypt_jwe_endpoint)
-spec.path(path="/api-keys", operations={**get_api_keys_endpoint, **create_api_key_endpoint})
-spec.path(path="/api-keys/{api_key_id}", operations=get_api_key_endpoint)
-spec.path(path="/api-keys/{api_key_string}", operations={**update_api_key_endpoint, **delete_api_key_endpoint})
+# Operations for paths served by more than one endpoint (HTTP method keys are disjoint)
+api_keys_collection_ops = {
+    "get": get_api_keys_endpoint["get"],
+    "post": create_api_key_endpoint["post"]
+}
+api_key_string_ops = {
+    "put": update_api_key_endpoint["put"],
+    "delete": delete_api_key_endpoint["delete"]
+}
+
+# (path, operations) pairs in the spec
+_PATHS = (
+    ("/token", login_endpoint),
+    ("/refresh", refresh_endpoint),
+    ("/decode", decode_endpoint),
+    ("/validate", validate_endpoint),
+    ("/protected", protected_endpoint),
+    ("/sensitive-action", sensitive_action_endpoint),
+    ("/generate-jwe-key", generate_jwe_key_endpoint),
+    ("/encrypt-jwe", encrypt_jwe_endpoint),
+    ("/decrypt-jwe", decrypt_jwe_endpoint),
+    ("/api-keys", api_keys_collection_ops),
+    ("/api-keys/{api_key_id}", get_api_key_endpoint),
+    ("/api-keys/{api_key_string}", api_key_string_ops),
+)
+
+# The complete OpenAPI 3.0.2 document; endpoint operations are referenced from the
+# literals above
+_SPEC_DICT = {
+    "openapi": "3.0.2",
+    "info": {
+        "title": "JWT Auth API",
+        "version": "1.0.0",
+        "description": "API for JWT authentication, JWE encryption, and API key management. Supports symmetric encryption of JWT tokens using JWE (JSON Web Encryption) for enhanced security.",
+        "contact": {"email": "support@dspai.com"}
+    },
+    "servers": [
+        {"url": "http://localhost:5000", "description": "Development server"}
+    ],
+    "tags": [
+        {"name": "auth", "description": "Authentication endpoints"},
+        {"name": "token", "description": "Token management endpoints"},
+        {"name": "jwe", "description": "JWE (JSON Web Encryption) endpoints"},
+        {"name": "api-keys", "description": "API key management endpoints"},
+    ],
+    "paths": dict(_PATHS),
+    "components": {
+        "securitySchemes": {
+            # Bearer JWT security scheme
+            "bearerAuth": {
+                "type": "http",
+                "scheme": "bearer",
+                "bearerFormat": "JWT"
+            }
+        },
+        "responses": {
+            "BadRequest": {"description": "Invalid request"},
+            "Unauthorized": {"description": "Authentication failed"},
+            "Forbidden": {"description": "Not authorized (admin only)"},
+            "ApiKeyNotFound": {"description": "API key not found"}
+        },
+        "parameters": {
+            "ApiKeyString": {
+                "name": "api_key_string",
+                "in": "path",
+                "required": True,
+                "schema": _STRING,
+                "description": "API key string"
+            }
+        },
+        "schemas": {
+            # Access Token Response Schema
+            "TokenResponse": {
+                "type": "object",
+                "properties": {
+                    "access_token": _STRING,
+                    "refresh_token": _STRING
+                }
+            },
+
+            # API Key Schema
+            "ApiKey": {
+                "type": "object",
+                "properties": {
+                    "id": _STRING,
+                    "owner": _STRING,
+                    "provider_permissions": _STRING_ARRAY,
+                    "endpoint_permissions": _STRING_ARRAY,
+                    "claims": {"$ref": "#/components/schemas/ClaimsBlock"}
+                }
+            },
+
+            # Static and dynamic claims block shared by API key schemas
+            "ClaimsBlock": {
+                "type": "object",
+                "properties": {
+                    "static": {
+                        "type": "object",
+                        "description": "Static claims to include in JWT",
+                        "additionalProperties": True
+                    },
+                    "dynamic": {
+                        "type": "object",
+                        "description": "Dynamic claims configuration",
+                        "additionalProperties": True
+                    }
+                }
+            },
+
+            # Inline API key configuration accepted by /token
+            "ApiKeyConfigInline": {
+                "type": "object",
+                "description": "Inline API key configuration (takes precedence over api_key)",
+                "properties": {
+                    "id": _STRING,
+                    "owner": _STRING,
+                    "claims": {"$ref": "#/components/schemas/ClaimsBlock"},
+                    "metadata": {
+                        "type": "object",
+                        "description": "Metadata not included in JWT but used for function calls",
+                        "additionalProperties": True
+                    }
+                }
+            },
+
+            # API Key Creation Schema
+            "ApiKeyCreation": {
+                "type": "object",
+                "required": ("owner",),
+                "properties": {
+                    "owner": _STRING,
+                    "provider_permissions": _STRING_ARRAY,
+                    "endpoint_permissions": _STRING_ARRAY,
+                    "static_claims": {"type": "object"}
+                }
+            }
+        }
+    }
+}
+
+def _media_types(operation):
+    """Yield the media type objects of an operation's request body and responses."""
+    bodies = [operation.get("requestBody", {}), *operation.get("responses", {}).values()]
+    for body in bodies:
+        for media in body.get("content", {}).values():
+            if "schema" in media:
+                yield media
+
+def _pool_duplicate_schemas(paths, schemas):
+    """
+    Move inline schemas repeated across operations into components.schemas.
+    
+    Schemas are keyed by a hash of their canonical JSON; each one used more than
+    once is registered as Schema<hash> and every occurrence becomes a $ref to it.
+    """
+    by_hash = {}
+    for operations in paths.values():
+        for operation in operations.values():
+            for media in _media_types(operation):
+                schema = media["schema"]
+                if "$ref" in schema:
+                    continue
+                canonical = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+                key = hashlib.blake2b(canonical, digest_size=6).hexdigest()
+                by_hash.setdefault(key, []).append(media)
+    
+    for key, media_types in by_hash.items():
+        if len(media_types) < 2:
+            continue
+        name = f"Schema{key}"
+        schemas[name] = media_types[0]["schema"]
+        ref = {"$ref": f"#/components/schemas/{name}"}
+        for media in media_types:
+            media["schema"] = ref
+
+_pool_duplicate_schemas(_SPEC_DICT["paths"], _SPEC_DICT["components"]["schemas"])
+
+# Documentation-only keys dropped from the lean spec
+_DOC_KEYS = frozenset({"examples", "example", "description"})
+
+# Mappings whose keys are names (properties, paths, status codes, ...), not spec keywords
+_NAME_MAPS = frozenset({"properties", "paths", "schemas", "responses", "parameters", "securitySchemes", "content"})
+
+def _lean(node, names=False, response=False):
+    """
+    Copy of a spec node without examples and descriptions.
+    
+    Response objects keep their description, which OpenAPI requires.
+    """
+    if isinstance(node, list):
+        return [_lean(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if names:
+        return {key: _lean(value, response=response) for key, value in node.items()}
+    return {
+        key: _lean(value, names=key in _NAME_MAPS, response=key == "responses")
+        for key, value in node.items()
+        if key not in _DOC_KEYS or (response and key == "description")
+    }
+
+def _etag(body):
+    """Content hash used as the ETag of a serialized spec."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def _encode(spec_dict):
+    """Serialize a spec dictionary to JSON bytes and an ETag."""
+    # orjson encodes in native code; OPT_NON_STR_KEYS accepts integer status codes
+    # (e.g. responses={200: ...}) the way json.dumps would
+    body = orjson.dumps(spec_dict, option=orjson.OPT_NON_STR_KEYS)
+    return body, _etag(body)
+
+# Each variant is serialized on its first request and then reused, so importing the
+# app (test collection, CLI tools) doesn't pay for formats nobody asks for
+@lru_cache(maxsize=None)
+def _spec_json():
+    """Full spec as JSON bytes and ETag."""
+    return _encode(_SPEC_DICT)
+
+@lru_cache(maxsize=None)
+def _spec_lean_json():
+    """Lean spec as JSON bytes and ETag."""
+    return _encode(_lean(_SPEC_DICT))
+
+@lru_cache(maxsize=None)
+def _spec_yaml():
+    """Full spec as YAML bytes and ETag."""
+    body = yaml.dump(_SPEC_DICT, Dumper=_SpecDumper).encode('utf-8')
+    return body, _etag(body)
 
 def get_swagger_dict():
-    """Return the Swagger specification as a dictionary."""
-    return spec.to_dict()
+    """Return the Swagger specification as a dictionary (shared; do not modify)."""
+    return _SPEC_DICT
+
+def get_swagger_files():
+    """
+    Return every serialized spec variant keyed by the URL path it is served at.
+    
+    Used by build_openapi.py to write the spec to disk at deploy time.
+    """
+    return {
+        "swagger.json": _spec_json()[0],
+        "swagger.lean.json": _spec_lean_json()[0],
+        "swagger.yaml": _spec_yaml()[0],
+    }
+
+# The spec only changes on deploy; clients may reuse it for an hour, then revalidate by ETag
+SPEC_CACHE_CONTROL = 'public, max-age=3600'
+
+@lru_cache(maxsize=16)
+def _compress(body, encoding):
+    """Compress a spec body once per encoding; the bodies themselves never change."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+def _spec_response(body, etag, mimetype='application/json'):
+    """Response for a pre-serialized spec, precompressed if the client accepts it (304 if the ETag matches)."""
+    encoding = None
+    if BROTLI_AVAILABLE and 'br' in request.accept_encodings:
+        encoding = 'br'
+    elif 'gzip' in request.accept_encodings:
+        encoding = 'gzip'
+    
+    if encoding:
+        body = _compress(body, encoding)
+        etag = f"{etag}-{encoding}"
+    
+    response = Response(body, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = SPEC_CACHE_CONTROL
+    return response.make_conditional(request)
 
 def get_swagger_json():
     """Return the Swagger specification as JSON."""
-    return jsonify(get_swagger_dict())
+    return _spec_response(*_spec_json())
+
+def get_swagger_lean_json():
+    """Return the Swagger specification as JSON without examples and descriptions."""
+    return _spec_response(*_spec_lean_json())
 
 def get_swagger_yaml():
     """Return the Swagger specification as YAML."""
-    return yaml.dump(get_swagger_dict())
+    return _spec_response(*_spec_yaml(), mimetype='application/yaml')
@@ -3,13 +3,30 @@ Test script for API key config payload feature
 Tests the new api_key_config parameter in the /token endpoint
 """
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import json
-from pprint import pprint
+from requests.adapters import HTTPAdapter
+import orjson
+from utils.console import ThreadLocalStdout
 
 # Base URL for the JWT service
 BASE_URL = "http://localhost:5000"
 
+# Shared session so all requests reuse keep-alive connections to the service
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+# Bodies are encoded with orjson, so the content type is set on the session
+_SESSION.headers["Content-Type"] = "application/json"
+
+
+def _pretty(data):
+    """Indented JSON for printing"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+
 USERNAME = "admin"
 PASSWORD = "password"
 
@@ -46,31 +63,31 @@ def test_login_with_api_key_config():
     }
     
     # Make the request
-    response = requests.post(f"{BASE_URL}/token", json=payload)
+    response = _SESSION.post(f"{BASE_URL}/token", data=orjson.dumps(payload))
     
     print(f"\nStatus Code: {response.status_code}")
     print(f"\nResponse:")
-    pprint(response.json())
+    print(_pretty(orjson.loads(response.content)))
     
     if response.status_code == 200:
         # Decode the token to verify claims
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         access_token = token_data.get("access_token")
         
         print("\n" + "=" * 80)
         print("Decoding the generated token to verify claims...")
         print("=" * 80)
         
-        decode_response = requests.post(
+        decode_response = _SESSION.post(
             f"{BASE_URL}/decode",
-            json={"token": access_token}
+            data=orjson.dumps({"token": access_token})
         )
         
         print(f"\nDecoded Token:")
-        pprint(decode_response.json())
+        print(_pretty(orjson.loads(decode_response.content)))
         
         # Verify expected claims are present
-        decoded = decode_response.json()
+        decoded = orjson.loads(decode_response.content)
         expected_claims = ["key", "tier", "models", "rate_limit", "project", "environment"]
         
         print("\n" + "=" * 80)
@@ -102,27 +119,27 @@ def test_login_with_api_key_reference():
         "api_key": "api_key_sas2py"
     }
     
-    response = requests.post(f"{BASE_URL}/token", json=payload)
+    response = _SESSION.post(f"{BASE_URL}/token", data=orjson.dumps(payload))
     
     print(f"\nStatus Code: {response.status_code}")
     print(f"\nResponse:")
-    pprint(response.json())
+    print(_pretty(orjson.loads(response.content)))
     
     if response.status_code == 200:
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         access_token = token_data.get("access_token")
         
         print("\n" + "=" * 80)
         print("Decoding the generated token...")
         print("=" * 80)
         
-        decode_response = requests.post(
+        decode_response = _SESSION.post(
             f"{BASE_URL}/decode",
-            json={"token": access_token}
+            data=orjson.dumps({"token": access_token})
         )
         
         print(f"\nDecoded Token:")
-        pprint(decode_response.json())
+        print(_pretty(orjson.loads(decode_response.content)))
         
         return True
     else:
@@ -156,20 +173,20 @@ def test_priority_api_key_config_over_api_key():
         }
     }
     
-    response = requests.post(f"{BASE_URL}/token", json=payload)
+    response = _SESSION.post(f"{BASE_URL}/token", data=orjson.dumps(payload))
     
     print(f"\nStatus Code: {response.status_code}")
     
     if response.status_code == 200:
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         access_token = token_data.get("access_token")
         
-        decode_response = requests.post(
+        decode_response = _SESSION.post(
             f"{BASE_URL}/decode",
-            json={"token": access_token}
+            data=orjson.dumps({"token": access_token})
         )
         
-        decoded = decode_response.json()
+        decoded = orjson.loads(decode_response.content)
         
         print(f"\nDecoded Token (relevant claims):")
         print(f"  key: {decoded.get('key')}")
@@ -220,20 +237,20 @@ def test_login_with_dynamic_claims_in_config():
         }
     }
     
-    response = requests.post(f"{BASE_URL}/token", json=payload)
+    response = _SESSION.post(f"{BASE_URL}/token", data=orjson.dumps(payload))
     
     print(f"\nStatus Code: {response.status_code}")
     
     if response.status_code == 200:
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         access_token = token_data.get("access_token")
         
-        decode_response = requests.post(
+        decode_response = _SESSION.post(
             f"{BASE_URL}/decode",
-            json={"token": access_token}
+            data=orjson.dumps({"token": access_token})
         )
         
-        decoded = decode_response.json()
+        decoded = orjson.loads(decode_response.content)
         
         print(f"\nDecoded Token (checking for dynamic claims):")
         print(f"  key: {decoded.get('key')}")
@@ -248,7 +265,7 @@ def test_login_with_dynamic_claims_in_config():
             return False
     else:
         print(f"\n✗ Login failed with status code: {response.status_code}")
-        pprint(response.json())
+        print(_pretty(orjson.loads(response.content)))
         return False
 
 
@@ -261,13 +278,27 @@ if __name__ == "__main__":
     print("Press Enter to continue or Ctrl+C to cancel...")
     input()
     
-    results = []
+    tests = [
+        ("Test 1: Inline API key config", test_login_with_api_key_config),
+        ("Test 2: API key reference", test_login_with_api_key_reference),
+        ("Test 3: Priority test", test_priority_api_key_config_over_api_key),
+        ("Test 4: Dynamic claims", test_login_with_dynamic_claims_in_config),
+    ]
     
-    # Run all tests
-    results.append(("Test 1: Inline API key config", test_login_with_api_key_config()))
-    results.append(("Test 2: API key reference", test_login_with_api_key_reference()))
-    results.append(("Test 3: Priority test", test_priority_api_key_config_over_api_key()))
-    results.append(("Test 4: Dynamic claims", test_login_with_dynamic_claims_in_config()))
+    # The tests are independent and only wait on the server, so run them concurrently;
+    # each one's output is buffered and printed in order once it is done
+    stdout = sys.stdout
+    sys.stdout = output = ThreadLocalStdout(stdout)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(output.capture, test) for _, test in tests]
+            for (test_name, _), future in zip(tests, futures):
+                text, result = future.result()
+                print(text, end="")
+                results.append((test_name, result))
+    finally:
+        sys.stdout = stdout
     
     # Print summary
     print("\n\n" + "=" * 80)
@@ -278,6 +309,8 @@ if __name__ == "__main__":
         status = "✓ PASSED" if result else "✗ FAILED"
         print(f"{status}: {test_name}")
     
+    _SESSION.close()
+    
     total_passed = sum(1 for _, result in results if result)
     total_tests = len(results)
     
@@ -4,9 +4,11 @@ Mock services for testing dynamic API key claims and model inference
 import os
 import json
 import time
+import orjson
 import random
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
-from flask import Flask, jsonify, request, Response
+from flask import Flask, request, Response
 
 # Create a mock Flask app for the billing service
 mock_app = Flask(__name__)
@@ -44,12 +46,24 @@ mock_data = {
     }
 }
 
+def _json(obj):
+    """JSON response serialized with orjson (no key sorting or indentation)"""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+# Budget bodies never change, so serialize them once instead of on every call
+_BUDGET_BODIES = MappingProxyType({
+    api_key_id: orjson.dumps(budget)
+    for api_key_id, budget in mock_data["budgets"].items()
+})
+_BUDGET_NOT_FOUND_BODY = orjson.dumps({"remaining_budget": 0})
+
 @mock_app.route('/api/budget/<api_key_id>', methods=['GET'])
 def get_budget(api_key_id):
     """Mock budget endpoint"""
-    if api_key_id in mock_data["budgets"]:
-        return jsonify(mock_data["budgets"][api_key_id])
-    return jsonify({"remaining_budget": 0}), 404
+    body = _BUDGET_BODIES.get(api_key_id)
+    if body is not None:
+        return Response(body, mimetype='application/json')
+    return Response(_BUDGET_NOT_FOUND_BODY, status=404, mimetype='application/json')
 
 @mock_app.route('/v2/models/<model_name>/generate', methods=['POST'])
 def triton_generate(model_name):
@@ -99,7 +113,7 @@ def triton_generate(model_name):
     time.sleep(processing_time)
     
     # Return Triton-style response
-    return jsonify({
+    return _json({
         "model_name": model_name,
         "model_version": "1",
         "outputs": [{
@@ -113,16 +127,23 @@ def triton_generate(model_name):
         }
     })
 
-def start_mock_services(port=5001, debug=False):
+def start_mock_services(port=5001, debug=False, threads=8):
     """
     Start the mock services for testing
     
     Args:
         port: Port number to run the server on
-        debug: Whether to run in debug mode
+        debug: Whether to run in debug mode (uses the Flask dev server)
+        threads: Number of worker threads, so concurrent dynamic claim
+            lookups don't queue behind slow mock inference calls
     """
     # Use this in test fixtures to start mock services
-    mock_app.run(host='0.0.0.0', port=port, debug=debug)
+    if debug:
+        mock_app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
+        return
+    
+    from waitress import serve
+    serve(mock_app, host='0.0.0.0', port=port, threads=threads)
     
 def get_mock_user_context(api_key_id: str = None) -> Dict[str, Any]:
     """
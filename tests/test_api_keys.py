@@ -1,7 +1,9 @@
 import json
+import os
 import pytest
 from unittest.mock import patch, MagicMock
-from flask_jwt_extended import decode_token
+from flask_jwt_extended import decode_token, create_access_token
+from utils.api_key import load_api_key_files, load_api_key_summaries, find_api_key_by_id, _resolve_api_key_data
 
 def test_api_key_openai_only(client, app):
     """Test that OpenAI-only API key adds correct provider permissions."""
@@ -99,3 +101,87 @@ def test_invalid_api_key(client, app):
     
     # Basic authentication should still work with invalid API key
     # No specific API key assertions here - the test is for invalid API keys
+
+def test_api_key_endpoints_require_admin_group(client, app):
+    """Test API key management endpoints reject non-admin users."""
+    with app.app_context():
+        user_token = create_access_token(identity="testuser", additional_claims={"groups": ["testers"]}, fresh=True)
+        admin_token = create_access_token(identity="adminuser", additional_claims={"groups": ["admins"]}, fresh=True)
+    
+    response = client.get('/api-keys', headers={'Authorization': f'Bearer {user_token}'})
+    assert response.status_code == 403
+    assert 'Administrator access required' in json.loads(response.data)['error']
+    
+    response = client.get('/api-keys', headers={'Authorization': f'Bearer {admin_token}'})
+    assert response.status_code == 200
+    api_keys = json.loads(response.data)
+    assert isinstance(api_keys, list)
+    assert all(entry['filename'] != 'base_api_key.yaml' for entry in api_keys)
+
+def test_load_api_key_files_reparses_only_changed_files(tmp_path):
+    """Test the API key registry only reparses files whose mtime changed."""
+    key_file = tmp_path / "key_one.yaml"
+    key_file.write_text("id: key-one\nowner: Team A\n")
+    
+    assert load_api_key_files(str(tmp_path))["key_one.yaml"]["owner"] == "Team A"
+    
+    # Unchanged files are served from the cache
+    with patch("utils.api_key.yaml.load") as mock_load:
+        assert load_api_key_files(str(tmp_path))["key_one.yaml"]["id"] == "key-one"
+        mock_load.assert_not_called()
+    
+    # Modified files are reparsed
+    key_file.write_text("id: key-one\nowner: Team B\n")
+    stat = key_file.stat()
+    os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_api_key_files(str(tmp_path))["key_one.yaml"]["owner"] == "Team B"
+    
+    # Removed files are evicted
+    key_file.unlink()
+    assert load_api_key_files(str(tmp_path)) == {}
+
+def test_find_api_key_by_id(tmp_path):
+    """Test API keys can be looked up by their id field."""
+    (tmp_path / "key_one.yaml").write_text("id: key-one\nowner: Team A\n")
+    (tmp_path / "key_two.yaml").write_text("id: key-two\nowner: Team B\n")
+    
+    assert find_api_key_by_id(str(tmp_path), "key-two")["owner"] == "Team B"
+    assert find_api_key_by_id(str(tmp_path), "missing") is None
+    
+    (tmp_path / "key_two.yaml").unlink()
+    assert find_api_key_by_id(str(tmp_path), "key-two") is None
+
+def test_load_api_key_summaries(tmp_path):
+    """Test API key summaries are shaped at parse time and exclude the base key."""
+    (tmp_path / "base_api_key.yaml").write_text("id: base\n")
+    (tmp_path / "key_one.yaml").write_text("id: key-one\nowner: Team A\nclaims:\n  static:\n    tier: premium\n")
+    
+    summaries = load_api_key_summaries(str(tmp_path))
+    assert summaries == [{
+        'filename': 'key_one.yaml',
+        'id': 'key-one',
+        'owner': 'Team A',
+        'provider_permissions': [],
+        'endpoint_permissions': [],
+        'static_claims': {'tier': 'premium'}
+    }]
+
+def test_resolve_api_key_data_reads_only_the_requested_file(tmp_path):
+    """Test a key lookup stats its own file instead of scanning the directory."""
+    (tmp_path / "base_api_key.yaml").write_text("id: base\n")
+    (tmp_path / "key_one.yaml").write_text("id: key-one\n")
+    (tmp_path.parent / "outside.yaml").write_text("id: outside\n")
+    
+    with patch("utils.api_key.os.scandir", side_effect=AssertionError("directory scanned")):
+        assert _resolve_api_key_data(str(tmp_path), "key_one")["id"] == "key-one"
+        assert _resolve_api_key_data(str(tmp_path), "missing")["id"] == "base"
+        # Names that would leave the directory fall back to the base key
+        assert _resolve_api_key_data(str(tmp_path), "../outside")["id"] == "base"
+    
+    # The file is reparsed once it changes
+    key_file = tmp_path / "key_one.yaml"
+    key_file.write_text("id: key-one-v2\n")
+    stat = key_file.stat()
+    os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _resolve_api_key_data(str(tmp_path), "key_one")["id"] == "key-one-v2"
+    assert find_api_key_by_id(str(tmp_path), "key-one-v2")["id"] == "key-one-v2"
@@ -1,5 +1,7 @@
 import json
+import os
 import pytest
+from unittest.mock import patch, MagicMock
 from flask_jwt_extended import decode_token
 
 def test_login_valid_credentials(client, app):
@@ -48,6 +50,23 @@ def test_login_missing_credentials(client):
     assert 'error' in data
     assert 'Missing username or password' in data['error']
 
+@pytest.mark.parametrize("credentials", [
+    {'username': 'testuser', 'password': 123},
+    {'username': ['testuser'], 'password': 'password'},
+    {'username': {'name': 'testuser'}, 'password': 'password'},
+])
+def test_login_non_string_credentials(client, credentials):
+    """Test login with non-string credentials returns 401 instead of crashing."""
+    response = client.post(
+        '/token',
+        data=json.dumps(credentials),
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 401
+    data = json.loads(response.data)
+    assert 'Invalid username or password' in data['error']
+
 def test_login_with_api_key(client, app):
     """Test login with valid credentials and API key returns JWT with additional claims."""
     # Use an API key that exists in the config
@@ -79,6 +98,118 @@ def test_login_with_api_key(client, app):
     assert 'models' in decoded
     assert 'gpt-3.5-turbo' in decoded['models']
 
+def test_login_reuses_cached_authentication(client):
+    """Test repeated logins with the same credentials hit the auth backend once."""
+    from app import _AUTH_CACHE
+    _AUTH_CACHE.clear()
+    
+    user_data = {"sub": "cacheduser", "name": "Cached User", "groups": ["testers"], "roles": ["user"]}
+    with patch('app._AUTHENTICATE', return_value=(True, user_data)) as mock_auth:
+        for _ in range(2):
+            response = client.post(
+                '/token',
+                data=json.dumps({'username': 'cacheduser', 'password': 'password'}),
+                content_type='application/json'
+            )
+            assert response.status_code == 200
+    
+    assert mock_auth.call_count == 1
+    _AUTH_CACHE.clear()
+
+def test_login_retries_backend_after_error(client):
+    """Test a backend error is not cached, so the next login reaches the backend again."""
+    from app import _AUTH_CACHE
+    _AUTH_CACHE.clear()
+    
+    user_data = {"sub": "flakyuser", "name": "Flaky User", "groups": ["testers"], "roles": ["user"]}
+    with patch('app._AUTHENTICATE', side_effect=[(None, {}), (True, user_data)]) as mock_auth:
+        statuses = [
+            client.post(
+                '/token',
+                data=json.dumps({'username': 'flakyuser', 'password': 'password'}),
+                content_type='application/json'
+            ).status_code
+            for _ in range(2)
+        ]
+    
+    assert statuses == [401, 200]
+    assert mock_auth.call_count == 2
+    _AUTH_CACHE.clear()
+
+@pytest.mark.parametrize("raw", [b"not json", b"{}", b"[false, {}]", b"[true]"])
+def test_shared_auth_cache_ignores_malformed_entries(client, raw):
+    """Test a corrupt or foreign Redis auth entry counts as a miss instead of failing the login."""
+    from app import _AUTH_CACHE
+    _AUTH_CACHE.clear()
+    
+    shared = MagicMock()
+    shared.get.return_value = raw
+    user_data = {"sub": "shareduser", "name": "Shared User", "groups": ["testers"], "roles": ["user"]}
+    with patch('app._AUTH_REDIS', shared), \
+            patch('app._AUTHENTICATE', return_value=(True, user_data)) as mock_auth:
+        response = client.post(
+            '/token',
+            data=json.dumps({'username': 'shareduser', 'password': 'password'}),
+            content_type='application/json'
+        )
+    
+    assert response.status_code == 200
+    assert mock_auth.call_count == 1
+    _AUTH_CACHE.clear()
+
+def test_shared_auth_cache_only_stores_successes(client):
+    """Test rejected credentials are not published to the shared Redis auth cache."""
+    from app import _AUTH_CACHE
+    _AUTH_CACHE.clear()
+    
+    shared = MagicMock()
+    shared.get.return_value = None
+    with patch('app._AUTH_REDIS', shared), patch('app._AUTHENTICATE', return_value=(False, {})):
+        response = client.post(
+            '/token',
+            data=json.dumps({'username': 'shareduser', 'password': 'wrong'}),
+            content_type='application/json'
+        )
+    
+    assert response.status_code == 401
+    shared.set.assert_not_called()
+    _AUTH_CACHE.clear()
+
+def test_file_auth_reports_missing_users_file_as_error(monkeypatch, tmp_path):
+    """Test file auth returns None (backend error) rather than False when the users file is missing."""
+    from auth.file_auth import authenticate_file
+    monkeypatch.setenv("USERS_FILE", str(tmp_path / "missing.yaml"))
+    assert authenticate_file("testuser", "password") == (None, {})
+
+def test_verify_password_hash_formats():
+    """Test file auth accepts bcrypt hashes and legacy SHA-256 hashes."""
+    from auth.file_auth import verify_password
+    sha256_hash = "5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8"
+    assert verify_password("password", sha256_hash)
+    assert not verify_password("wrong", sha256_hash)
+    
+    bcrypt = pytest.importorskip("bcrypt")
+    bcrypt_hash = bcrypt.hashpw(b"password", bcrypt.gensalt(rounds=4)).decode()
+    assert verify_password("password", bcrypt_hash)
+    assert not verify_password("wrong", bcrypt_hash)
+
+def test_load_users_reloads_only_when_file_changes(tmp_path):
+    """Test the users file is reparsed only after its mtime changes."""
+    from auth.file_auth import load_users
+    users_file = tmp_path / "users.yaml"
+    users_file.write_text("alice:\n  name: Alice\n")
+    
+    assert load_users(str(users_file))["alice"]["name"] == "Alice"
+    
+    with patch("auth.file_auth.yaml.load") as mock_load:
+        assert load_users(str(users_file))["alice"]["name"] == "Alice"
+        mock_load.assert_not_called()
+    
+    users_file.write_text("alice:\n  name: Alice Smith\n")
+    stat = users_file.stat()
+    os.utime(users_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_users(str(users_file))["alice"]["name"] == "Alice Smith"
+
 def test_protected_route(client, auth_token):
     """Test protected route requires valid JWT."""
     # With valid token
@@ -106,3 +237,72 @@ def test_token_refresh(client, auth_token):
     # In a real app, you'd use a refresh token, but for simplicity we're using the same fixture
     # This test is included to demonstrate how to test the refresh endpoint
     assert response.status_code == 422  # Unprocessable Entity for wrong token type
+
+def test_load_users_prefers_newer_json(tmp_path):
+    """Test a users.json at least as new as users.yaml is loaded instead of the YAML."""
+    from auth.file_auth import load_users
+    users_file = tmp_path / "users.yaml"
+    users_file.write_text("alice:\n  name: From YAML\n")
+    json_file = tmp_path / "users.json"
+    json_file.write_text('{"alice": {"name": "From JSON"}}')
+    
+    stat = users_file.stat()
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_users(str(users_file))["alice"]["name"] == "From JSON"
+    
+    # A stale JSON file is ignored
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+    assert load_users(str(users_file))["alice"]["name"] == "From YAML"
+
+def test_stale_users_json_warns_once_per_change(tmp_path, caplog):
+    """Test the stale users.json warning is logged once, not on every load."""
+    from auth.file_auth import load_users
+    users_file = tmp_path / "users.yaml"
+    users_file.write_text("alice:\n  name: From YAML\n")
+    json_file = tmp_path / "users.json"
+    json_file.write_text('{"alice": {"name": "From JSON"}}')
+    stat = users_file.stat()
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+    
+    with caplog.at_level("WARNING", logger="auth.file_auth"):
+        for _ in range(3):
+            load_users(str(users_file))
+    assert sum("is older than" in r.getMessage() for r in caplog.records) == 1
+    
+    # Touching the JSON file (still stale) is a new change and warns again
+    caplog.clear()
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 500_000_000))
+    with caplog.at_level("WARNING", logger="auth.file_auth"):
+        load_users(str(users_file))
+        load_users(str(users_file))
+    assert sum("is older than" in r.getMessage() for r in caplog.records) == 1
+
+@pytest.mark.parametrize("username", ["a" * 257, 12345, ["testuser"]])
+def test_ldap_rejects_invalid_username_before_lookup(monkeypatch, username):
+    """Test over-long and non-string usernames are rejected without touching LDAP."""
+    from auth import ldap_auth
+    monkeypatch.setattr(ldap_auth, "LDAP_AVAILABLE", True)
+    
+    with patch.object(ldap_auth, "get_ldap_pool") as get_pool, \
+            patch.object(ldap_auth, "_initialize") as initialize:
+        assert ldap_auth.authenticate_ldap(username, "password") == (False, {})
+    
+    get_pool.assert_not_called()
+    initialize.assert_not_called()
+
+def test_ldap_pool_closes_connection_on_any_error():
+    """Test a pooled LDAP connection is unbound, not silently dropped, when the caller raises."""
+    from auth import ldap_auth
+    conn = MagicMock()
+    with patch.object(ldap_auth, "_initialize", return_value=conn):
+        pool = ldap_auth.LDAPConnectionPool("ldap://example", "cn=admin", "secret", size=1)
+        with pytest.raises(KeyError):
+            with pool.connection():
+                raise KeyError("cn")
+        conn.unbind_s.assert_called_once()
+        
+        # The slot was released and the closed connection was not put back
+        fresh = MagicMock()
+        with patch.object(ldap_auth, "_initialize", return_value=fresh):
+            with pool.connection() as borrowed:
+                assert borrowed is fresh
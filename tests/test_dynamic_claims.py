@@ -6,6 +6,12 @@ import yaml
 from unittest.mock import patch, MagicMock
 from flask_jwt_extended import decode_token
 
+# Prefer the libyaml-backed dumper when available
+try:
+    from yaml import CSafeDumper
+except ImportError:
+    from yaml import SafeDumper as CSafeDumper
+
 @pytest.fixture
 def setup_dynamic_claims_test(app, monkeypatch):
     """Create temporary API key files with dynamic claims for testing."""
@@ -45,10 +51,10 @@ def setup_dynamic_claims_test(app, monkeypatch):
         test_api_key = "test_dynamic_key"
         api_key_file = os.path.join(temp_dir, f"{test_api_key}.yaml")
         with open(api_key_file, 'w') as f:
-            yaml.dump(api_key_data, f)
+            yaml.dump(api_key_data, f, Dumper=CSafeDumper)
         
-        # Set the API_KEYS_DIR environment variable to point to our temp directory
-        monkeypatch.setenv("API_KEYS_DIR", temp_dir)
+        # Point the API key registry at our temp directory
+        monkeypatch.setattr("utils.api_key.API_KEYS_DIR", temp_dir)
         
         yield test_api_key
 
@@ -131,10 +137,10 @@ def setup_api_claims_test(app, monkeypatch):
         test_api_key = "test_api_key"
         api_key_file = os.path.join(temp_dir, f"{test_api_key}.yaml")
         with open(api_key_file, 'w') as f:
-            yaml.dump(api_key_data, f)
+            yaml.dump(api_key_data, f, Dumper=CSafeDumper)
         
-        # Set the API_KEYS_DIR environment variable to point to our temp directory
-        monkeypatch.setenv("API_KEYS_DIR", temp_dir)
+        # Point the API key registry at our temp directory
+        monkeypatch.setattr("utils.api_key.API_KEYS_DIR", temp_dir)
         monkeypatch.setenv("INTERNAL_API_TOKEN", "test-internal-token")
         
         yield test_api_key
@@ -183,3 +189,27 @@ def test_api_based_dynamic_claims(client, app, setup_api_claims_test):
             if key in decoded:
                 has_any_api_data = True
                 break
+
+def test_get_user_category_lookup_modes():
+    """Test category assignment for each lookup mode."""
+    from claims.group_category import get_user_category
+    metadata = {
+        "categories": {
+            "basic": {"groups": ["users"], "tier": 1},
+            "pro": {"groups": ["users", "grp_tier2"], "tier": 3},
+            "team": {"groups": ["grp_tier2"], "tier": 3}
+        }
+    }
+    
+    result = get_user_category(["grp_tier2", "users"], "FIRST_MATCH", metadata=metadata)
+    assert result["category"]["name"] == "basic"
+    
+    # Highest tier wins; ties go to the category defined first
+    result = get_user_category(["grp_tier2", "users"], "TIERED_MATCH", metadata=metadata)
+    assert result["category"]["name"] == "pro"
+    
+    result = get_user_category(["grp_tier2"], "ALL_MATCHES", metadata=metadata)
+    assert [c["name"] for c in result["categories"]] == ["pro", "team"]
+    
+    result = get_user_category(["nobody"], "TIERED_MATCH", metadata=metadata)
+    assert result["category"] is None
@@ -7,6 +7,7 @@ This module tests symmetric encryption of JWT tokens using JWE.
 import pytest
 import json
 import base64
+import hashlib
 import secrets
 from utils.jwe_handler import (
     JWEHandler,
@@ -60,6 +61,10 @@ class TestJWEHandler:
         # Decrypt
         decrypted = handler.decrypt(encrypted)
         assert decrypted == payload
+        
+        # Pre-serialized JSON bytes are encrypted as-is
+        encrypted = handler.encrypt(json.dumps(payload).encode('utf-8'))
+        assert handler.decrypt(encrypted) == payload
     
     def test_encrypt_decrypt_jwt_token(self):
         """Test encryption and decryption of a JWT token"""
@@ -226,6 +231,36 @@ class TestJWEHandler:
         with pytest.raises(Exception):
             handler2.decrypt(encrypted)
 
+    def test_gcm_nonces_are_unique(self):
+        """Test that every GCM token gets a fresh IV, across nonce buffer refills"""
+        handler = JWEHandler(content_encryption='A256GCM')
+        ivs = {handler.encrypt({'n': i}).split('.')[2] for i in range(1000)}
+        assert len(ivs) == 1000
+
+    def test_gcm_tokens_interoperate_with_jwcrypto(self):
+        """Test that AESGCM-encrypted tokens match the jwcrypto wire format both ways"""
+        from jwcrypto import jwe
+
+        key = JWEHandler.generate_encryption_key('A256GCM', 'base64')
+        payload = {'sub': 'user123', 'roles': ['admin', 'user']}
+
+        for compression in [None, 'DEF']:
+            handler = JWEHandler(encryption_key=key, content_encryption='A256GCM', compression=compression)
+
+            # Our token decrypts with jwcrypto
+            jwe_obj = jwe.JWE()
+            jwe_obj.deserialize(handler.encrypt(payload, kid='key-1'))
+            jwe_obj.decrypt(handler.jwk_key)
+            assert json.loads(jwe_obj.payload) == payload
+
+            # A jwcrypto token decrypts with the handler
+            protected = {'alg': 'dir', 'enc': 'A256GCM'}
+            if compression:
+                protected['zip'] = compression
+            jwe_obj = jwe.JWE(json.dumps(payload).encode('utf-8'), protected=json.dumps(protected))
+            jwe_obj.add_recipient(handler.jwk_key)
+            assert handler.decrypt(jwe_obj.serialize(compact=True)) == payload
+
 
 class TestJWEEndpoints:
     """Test JWE API endpoints"""
@@ -292,6 +327,22 @@ class TestJWEEndpoints:
         
         decrypt_data = json.loads(response.data)
         assert decrypt_data['jwt_token'] == jwt_token
+        assert 'plaintext_sha256' not in encrypt_data
+    
+    def test_encrypt_return_digest(self, client, encryption_key, jwt_token):
+        """Test that /encrypt-jwe returns the plaintext digest when asked"""
+        response = client.post(
+            '/encrypt-jwe',
+            json={
+                'token': jwt_token,
+                'encryption_key': encryption_key,
+                'return_digest': True
+            }
+        )
+        assert response.status_code == 200
+        
+        data = json.loads(response.data)
+        assert data['plaintext_sha256'] == hashlib.sha256(jwt_token.encode('utf-8')).hexdigest()
     
     def test_encrypt_payload_endpoint(self, client, encryption_key):
         """Test encrypting a payload directly"""
@@ -0,0 +1,80 @@
+import json
+
+
+def test_swagger_json(client):
+    """Test that the Swagger spec is served as JSON with an ETag."""
+    response = client.get('/swagger.json')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert response.headers.get('ETag')
+    assert 'max-age' in response.headers.get('Cache-Control', '')
+    
+    spec = json.loads(response.data)
+    assert spec['info']['title'] == "JWT Auth API"
+    assert "/token" in spec['paths']
+
+def test_swagger_json_not_modified(client):
+    """Test that a matching If-None-Match gets a 304 without a body."""
+    etag = client.get('/swagger.json').headers['ETag']
+    
+    response = client.get('/swagger.json', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert not response.data
+    
+    etag = client.get('/swagger.yaml').headers['ETag']
+    assert client.get('/swagger.yaml', headers={'If-None-Match': etag}).status_code == 304
+
+def test_swagger_yaml(client):
+    """Test that the YAML spec matches the JSON one."""
+    import yaml
+    
+    response = client.get('/swagger.yaml')
+    assert response.status_code == 200
+    assert yaml.safe_load(response.data) == json.loads(client.get('/swagger.json').data)
+
+def test_swagger_shared_schemas_resolve(client):
+    """Test that every $ref in the spec points at a registered component."""
+    spec = json.loads(client.get('/swagger.json').data)
+    
+    def refs(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == '$ref':
+                    yield value
+                else:
+                    yield from refs(value)
+        elif isinstance(node, list):
+            for item in node:
+                yield from refs(item)
+    
+    for ref in refs(spec):
+        assert ref.startswith('#/components/')
+        _, _, kind, name = ref.split('/')
+        assert name in spec['components'][kind]
+
+def test_swagger_lean_json(client):
+    """Test that the lean spec drops examples and descriptions but keeps the API surface."""
+    full = json.loads(client.get('/swagger.json').data)
+    response = client.get('/swagger.lean.json')
+    assert response.status_code == 200
+    assert len(response.data) < len(json.dumps(full))
+    
+    lean = json.loads(response.data)
+    assert lean['paths'].keys() == full['paths'].keys()
+    login = lean['paths']['/token']['post']
+    assert 'description' not in login
+    assert 'examples' not in login['requestBody']['content']['application/json']
+    # Response objects keep their required description
+    assert login['responses']['200']['description']
+
+def test_swagger_json_gzip(client):
+    """Test that the spec is served precompressed to clients that accept gzip."""
+    import gzip
+    
+    plain = client.get('/swagger.json')
+    response = client.get('/swagger.json', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'] != plain.headers['ETag']
+    assert gzip.decompress(response.data) == plain.data
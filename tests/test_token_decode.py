@@ -1,6 +1,7 @@
 import json
 import pytest
-from flask_jwt_extended import create_access_token
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token, decode_token
 
 def test_decode_valid_token(client, app):
     """Test decoding a valid JWT token."""
@@ -31,6 +32,27 @@ def test_decode_valid_token(client, app):
     assert data['tier'] == 'premium'
     assert set(data['models']) == {"gpt-4", "llama3-70b"}
 
+def test_decode_reuses_cached_result(client, app):
+    """Test decoding the same token twice only verifies the signature once."""
+    from app import _DECODE_CACHE
+    _DECODE_CACHE.clear()
+    
+    with app.app_context():
+        token = create_access_token(identity="testuser")
+    
+    with patch('app.decode_token', side_effect=decode_token) as mock_decode:
+        for _ in range(2):
+            response = client.post(
+                '/decode',
+                data=json.dumps({'token': token}),
+                content_type='application/json'
+            )
+            assert response.status_code == 200
+            assert json.loads(response.data)['sub'] == 'testuser'
+    
+    assert mock_decode.call_count == 1
+    _DECODE_CACHE.clear()
+
 def test_decode_invalid_token(client):
     """Test decoding an invalid JWT token."""
     response = client.post(
@@ -1,66 +1,304 @@
 import os
+import stat
 import yaml
 import json
 import logging
 import importlib
 import requests
 import datetime
-from typing import Dict, Any, Optional, Callable, Union, Tuple
+import threading
+from typing import Dict, Any, Optional, Callable, Union, Tuple, List
 from datetime import datetime, timedelta
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Prefer the libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+
 logger = logging.getLogger(__name__)
 
 # Define the name of the base API key file
 BASE_API_KEY_FILE = "base_api_key.yaml"
 
+# API key files directory, resolved once at import (app.py imports it from here)
+API_KEYS_DIR = os.getenv("API_KEYS_DIR", "config/api_keys")
 
-def get_api_key_metadata(api_key: str = None) -> Dict[str, Any]:
+# Parsed API key files per directory: {api_keys_dir: {filename: (mtime_ns, key_data, summary)}}
+_API_KEY_CACHE: Dict[str, Dict[str, Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]]] = {}
+# Secondary index per directory: {api_keys_dir: {key id: filename}}
+_ID_INDEX: Dict[str, Dict[str, str]] = {}
+_API_KEY_CACHE_LOCK = threading.RLock()
+
+_EMPTY: Dict[str, Any] = {}
+
+
+def _summarize_api_key(filename: str, key_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
-    Get metadata from the API key configuration file.
-    This metadata is not included in JWT tokens but can be used for function calls and API requests.
+    Build the listing entry for an API key once, when its file is parsed
     
     Args:
-        api_key: The API key to look up, if None or empty, will use the base API key
+        filename: Name of the API key file
+        key_data: Parsed key data
+        
+    Returns:
+        Summary dict for the API key listing, or None if the data can't be summarized
+    """
+    try:
+        claims = key_data.get('claims') or _EMPTY
+        return {
+            'filename': filename,
+            'id': key_data.get('id', ''),
+            'owner': key_data.get('owner', ''),
+            'provider_permissions': key_data.get('provider_permissions', []),
+            'endpoint_permissions': key_data.get('endpoint_permissions', []),
+            'static_claims': claims.get('static') or {}
+        }
+    except Exception as e:
+        logger.error(f"Error reading API key file {filename}: {str(e)}")
+        return None
+
+
+def _parse_api_key_file(path: str, filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one API key file
     
+    Args:
+        path: Full path of the API key file
+        filename: Name of the file, for log messages
+        
     Returns:
-        Dict containing the metadata from the API key configuration
+        The parsed key data, or None if the file can't be read or isn't a mapping
     """
     try:
-        # Get API keys directory path from environment variable or use default
-        api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
+        with open(path, 'r') as f:
+            key_data = yaml.load(f, Loader=CSafeLoader)
+        if not isinstance(key_data, dict):
+            raise ValueError("API key file does not contain a mapping")
+        return key_data
+    except Exception as e:
+        logger.error(f"Error reading API key file {filename}: {str(e)}")
+        return None
+
+
+def _refresh_api_key_dir(api_keys_dir: str) -> Dict[str, Tuple[int, Dict[str, Any]]]:
+    """
+    Bring the cache for a directory up to date, reparsing only files whose mtime changed.
+    Files removed from the directory are evicted. Must be called with the cache lock held.
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
         
-        # Check if directory exists
-        if not os.path.exists(api_keys_dir):
-            logger.error(f"API keys directory not found: {api_keys_dir}")
-            return {}
+    Returns:
+        The cache dict for the directory
+    """
+    if not os.path.isdir(api_keys_dir):
+        _API_KEY_CACHE.pop(api_keys_dir, None)
+        _ID_INDEX.pop(api_keys_dir, None)
+        return {}
+    
+    cached = _API_KEY_CACHE.setdefault(api_keys_dir, {})
+    changed = api_keys_dir not in _ID_INDEX
+    seen = set()
+    
+    with os.scandir(api_keys_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.name.endswith('.yaml') or not entry.is_file():
+                continue
+            seen.add(entry.name)
+            
+            mtime = entry.stat().st_mtime_ns
+            current = cached.get(entry.name)
+            if current is not None and current[0] == mtime:
+                continue
+            
+            changed = True
+            key_data = _parse_api_key_file(entry.path, entry.name)
+            if key_data is None:
+                cached.pop(entry.name, None)
+                continue
+            
+            cached[entry.name] = (mtime, key_data, _summarize_api_key(entry.name, key_data))
+    
+    for filename in list(cached):
+        if filename not in seen:
+            del cached[filename]
+            changed = True
+    
+    if changed:
+        id_index = {}
+        for filename in sorted(cached):
+            key_id = cached[filename][1].get('id')
+            if key_id:
+                id_index.setdefault(key_id, filename)
+        _ID_INDEX[api_keys_dir] = id_index
+    
+    return cached
+
+
+def load_api_key_files(api_keys_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load every API key file in a directory, reparsing only files whose mtime changed.
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
         
-        # Determine which API key file to use
-        api_key_file = None
+    Returns:
+        Dict mapping filename to parsed key data (shared with the cache - do not mutate)
+    """
+    with _API_KEY_CACHE_LOCK:
+        cached = _refresh_api_key_dir(api_keys_dir)
+        return {filename: entry[1] for filename, entry in cached.items()}
+
+
+def load_api_key_summaries(api_keys_dir: str) -> List[Dict[str, Any]]:
+    """
+    Get the listing entries for every API key in a directory, excluding the base key
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
         
+    Returns:
+        List of summary dicts built when each file was parsed (shared with the cache - do not mutate)
+    """
+    with _API_KEY_CACHE_LOCK:
+        cached = _refresh_api_key_dir(api_keys_dir)
+        return [
+            entry[2] for filename, entry in cached.items()
+            if filename != BASE_API_KEY_FILE and entry[2] is not None
+        ]
+
+
+def find_api_key_by_id(api_keys_dir: str, api_key_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up an API key configuration by its 'id' field
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
+        api_key_id: The ID to look up
+        
+    Returns:
+        The parsed key data (shared with the cache - do not mutate), or None if not found
+    """
+    with _API_KEY_CACHE_LOCK:
+        cached = _refresh_api_key_dir(api_keys_dir)
+        filename = _ID_INDEX.get(api_keys_dir, {}).get(api_key_id)
+        if filename is None:
+            return None
+        return cached[filename][1]
+
+
+def _load_api_key_file(api_keys_dir: str, filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Get one API key file from the cache, statting and reparsing only that file.
+    Must be called with the cache lock held.
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
+        filename: Name of the API key file
+        
+    Returns:
+        The parsed key data (shared with the cache - do not mutate), or None if the
+        file doesn't exist or can't be parsed
+    """
+    # Only plain, visible file names in the directory itself, as the directory scan would find
+    if os.path.basename(filename) != filename or filename.startswith('.'):
+        return None
+    
+    cached = _API_KEY_CACHE.setdefault(api_keys_dir, {})
+    path = os.path.join(api_keys_dir, filename)
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        if cached.pop(filename, None) is not None:
+            _ID_INDEX.pop(api_keys_dir, None)
+        return None
+    
+    current = cached.get(filename)
+    if current is not None and current[0] == st.st_mtime_ns:
+        return current[1]
+    
+    # The id index is rebuilt on the next directory scan, since this file's id may have changed
+    _ID_INDEX.pop(api_keys_dir, None)
+    key_data = _parse_api_key_file(path, filename)
+    if key_data is None:
+        cached.pop(filename, None)
+        return None
+    cached[filename] = (st.st_mtime_ns, key_data, _summarize_api_key(filename, key_data))
+    return key_data
+
+
+def invalidate_api_key_cache(api_keys_dir: str, filename: str = None) -> None:
+    """
+    Drop cached API key data so the next load rereads it from disk
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
+        filename: Specific file to drop, or None to drop the whole directory
+    """
+    with _API_KEY_CACHE_LOCK:
+        if filename is None:
+            _API_KEY_CACHE.pop(api_keys_dir, None)
+        else:
+            _API_KEY_CACHE.get(api_keys_dir, {}).pop(filename, None)
+        _ID_INDEX.pop(api_keys_dir, None)
+
+
+def _resolve_api_key_data(api_keys_dir: str, api_key: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Find the config for an API key, falling back to the base API key
+    
+    The returned dict comes from the mtime-cached registry, so it is the same object
+    on every call until the file changes (callers may cache derived data by identity).
+    
+    Args:
+        api_keys_dir: Directory containing the API key YAML files
+        api_key: The API key to look up, if None or empty, the base API key is used
+        
+    Returns:
+        The parsed key data (shared with the cache - do not mutate), or None if neither file exists
+    """
+    with _API_KEY_CACHE_LOCK:
         # If API key is provided, try to find its config file
         if api_key:
-            specific_key_file = os.path.join(api_keys_dir, f"{api_key}.yaml")
-            if os.path.exists(specific_key_file):
-                api_key_file = specific_key_file
-            else:
-                logger.warning(f"Config file for API key not found: {api_key}")
-                logger.info("Falling back to base API key")
+            key_data = _load_api_key_file(api_keys_dir, f"{api_key}.yaml")
+            if key_data is not None:
+                return key_data
+            logger.warning(f"Config file for API key not found: {api_key}")
+            logger.info("Falling back to base API key")
         
         # If no API key provided or specific key not found, use the base API key
-        if not api_key_file:
-            base_key_file = os.path.join(api_keys_dir, BASE_API_KEY_FILE)
-            if os.path.exists(base_key_file):
-                api_key_file = base_key_file
-                logger.info("Using base API key")
-            else:
-                logger.warning(f"Base API key file not found: {BASE_API_KEY_FILE}")
-                return {}
+        key_data = _load_api_key_file(api_keys_dir, BASE_API_KEY_FILE)
+    if key_data is None:
+        logger.warning(f"Base API key file not found: {BASE_API_KEY_FILE}")
+        return None
+    logger.info("Using base API key")
+    return key_data
+
+
+def get_api_key_metadata(api_key: str = None) -> Dict[str, Any]:
+    """
+    Get metadata from the API key configuration file.
+    This metadata is not included in JWT tokens but can be used for function calls and API requests.
+    
+    Args:
+        api_key: The API key to look up, if None or empty, will use the base API key
+    
+    Returns:
+        Dict containing the metadata from the API key configuration
+    """
+    try:
+        # Check if directory exists
+        if not os.path.exists(API_KEYS_DIR):
+            logger.error(f"API keys directory not found: {API_KEYS_DIR}")
+            return {}
         
-        # Load API key config from file
-        with open(api_key_file, 'r') as f:
-            key_data = yaml.safe_load(f)
+        # Look up the API key config in the mtime-cached registry
+        key_data = _resolve_api_key_data(API_KEYS_DIR, api_key)
+        if key_data is None:
+            return {}
         
         # Extract metadata section
         metadata = key_data.get('metadata', {})
@@ -113,39 +351,15 @@ def get_additional_claims(api_key: str = None, user_context: Dict[str, Any] = No
             logger.info("Using inline API key configuration")
             key_data = api_key_config
         else:
-            # Get API keys directory path from environment variable or use default
-            api_keys_dir = os.getenv("API_KEYS_DIR", "config/api_keys")
-            
             # Check if directory exists
-            if not os.path.exists(api_keys_dir):
-                logger.error(f"API keys directory not found: {api_keys_dir}")
+            if not os.path.exists(API_KEYS_DIR):
+                logger.error(f"API keys directory not found: {API_KEYS_DIR}")
                 return {}
             
-            # Determine which API key file to use
-            api_key_file = None
-            
-            # If API key is provided, try to find its config file
-            if api_key:
-                specific_key_file = os.path.join(api_keys_dir, f"{api_key}.yaml")
-                if os.path.exists(specific_key_file):
-                    api_key_file = specific_key_file
-                else:
-                    logger.warning(f"Config file for API key not found: {api_key}")
-                    logger.info("Falling back to base API key")
-            
-            # If no API key provided or specific key not found, use the base API key
-            if not api_key_file:
-                base_key_file = os.path.join(api_keys_dir, BASE_API_KEY_FILE)
-                if os.path.exists(base_key_file):
-                    api_key_file = base_key_file
-                    logger.info("Using base API key")
-                else:
-                    logger.warning(f"Base API key file not found: {BASE_API_KEY_FILE}")
-                    return {}
-            
-            # Load API key config from file
-            with open(api_key_file, 'r') as f:
-                key_data = yaml.safe_load(f)
+            # Look up the API key config in the mtime-cached registry
+            key_data = _resolve_api_key_data(API_KEYS_DIR, api_key)
+            if key_data is None:
+                return {}
         
         # Extract static claims
         static_claims = key_data.get('claims', {}).get('static', {})
@@ -0,0 +1,40 @@
+"""
+Console helpers shared by the example and manual test scripts
+"""
+
+import io
+import threading
+from typing import Any, Callable, Tuple
+
+
+class ThreadLocalStdout(io.TextIOBase):
+    """stdout wrapper that lets worker threads print into their own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, func: Callable, *args) -> Tuple[str, Any]:
+        """
+        Run func in the current thread with its output buffered
+        
+        Args:
+            func: Callable to run
+            *args: Positional arguments for func
+            
+        Returns:
+            Tuple of (everything func printed, func's return value)
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            result = func(*args)
+            return self._local.buffer.getvalue(), result
+        finally:
+            self._local.buffer = None
@@ -8,11 +8,18 @@ Supported algorithms:
 - Key Management: dir (Direct use of shared symmetric key)
 - Content Encryption: A128GCM, A192GCM, A256GCM, A128CBC-HS256, A192CBC-HS384, A256CBC-HS512
 - Compression: DEF (Deflate)
+
+GCM algorithms are encrypted and decrypted directly with cryptography's AESGCM;
+jwcrypto handles the CBC-HMAC algorithms and any token the direct path doesn't cover.
 """
 
 import os
+import zlib
 import logging
-from typing import Dict, Any, Optional, Tuple
+import threading
+import orjson
+from typing import Dict, Any, Optional, Tuple, Union
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from jwcrypto import jwk, jwe
 from jwcrypto.common import json_encode, json_decode
 import base64
@@ -20,6 +27,95 @@ import secrets
 
 logger = logging.getLogger(__name__)
 
+# ISA-L's igzip (SIMD longest-match search) produces the same raw DEFLATE stream as zlib,
+# only faster; zlib stays the fallback
+ISAL_AVAILABLE = False
+try:
+    from isal import isal_zlib as _deflate_lib
+    ISAL_AVAILABLE = True
+except ImportError:
+    _deflate_lib = zlib
+    logger.debug("isal not installed, using zlib for JWE 'DEF' compression (pip install isal)")
+
+# Content encryption algorithms handled directly with cryptography's AESGCM (OpenSSL, AES-NI);
+# the CBC-HMAC algorithms go through jwcrypto
+GCM_ALGORITHMS = frozenset({'A128GCM', 'A192GCM', 'A256GCM'})
+
+# Protected header fields the AESGCM path understands; anything else is left to jwcrypto
+_FAST_PATH_HEADER_FIELDS = frozenset({'alg', 'enc', 'zip', 'kid'})
+
+# Upper bound for inflated 'DEF' payloads, so a small token can't expand without limit
+MAX_DECOMPRESSED_SIZE = 16 << 20
+
+GCM_IV_SIZE = 12
+GCM_TAG_SIZE = 16
+
+
+def _b64url_encode(data: bytes) -> str:
+    """Base64url-encode without padding, as used by JWE compact serialization"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode unpadded base64url"""
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+# Incremented in forked children so inherited nonce buffers are never reused
+_fork_generation = 0
+
+
+def _after_fork_in_child():
+    global _fork_generation
+    _fork_generation += 1
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class _NonceBuffer(threading.local):
+    """
+    Per-thread pool of CSPRNG bytes sliced into GCM nonces
+    
+    Draws entropy in 4 KiB batches instead of one getrandom() call per token.
+    Each slice is used once, and the buffer is discarded after a fork so parent
+    and child never hand out the same nonce.
+    """
+    
+    SIZE = 4096
+    
+    def __init__(self):
+        self._buffer = b''
+        self._pos = 0
+        self._generation = -1
+    
+    def next_nonce(self, size: int = GCM_IV_SIZE) -> bytes:
+        pos = self._pos
+        if pos + size > len(self._buffer) or self._generation != _fork_generation:
+            self._buffer = secrets.token_bytes(self.SIZE)
+            self._generation = _fork_generation
+            pos = 0
+        self._pos = pos + size
+        return self._buffer[pos:pos + size]
+
+
+_NONCES = _NonceBuffer()
+
+
+def _deflate(data: bytes) -> bytes:
+    """Raw DEFLATE (RFC 1951, no zlib header) for the JWE 'zip': 'DEF' header"""
+    compressor = _deflate_lib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _inflate(data: bytes) -> bytes:
+    """Inflate raw DEFLATE data, refusing output larger than MAX_DECOMPRESSED_SIZE"""
+    decompressor = _deflate_lib.decompressobj(wbits=-zlib.MAX_WBITS)
+    inflated = decompressor.decompress(data, MAX_DECOMPRESSED_SIZE)
+    if decompressor.unconsumed_tail:
+        raise ValueError("Decompressed JWE payload exceeds size limit")
+    return inflated + decompressor.flush()
+
 
 class JWEHandler:
     """Handler for JWE encryption and decryption operations"""
@@ -77,6 +173,15 @@ class JWEHandler:
             # Generate a new key if none provided
             self.jwk_key = self._generate_key()
             logger.warning("No encryption key provided, generated a new one")
+        
+        # GCM algorithms are encrypted directly with AESGCM; the protected header for
+        # tokens without a kid is the same every time, so encode it once
+        if content_encryption in GCM_ALGORITHMS:
+            self._aesgcm = AESGCM(self._key_bytes)
+            self._header_b64 = self._encode_protected_header(None)
+        else:
+            self._aesgcm = None
+            self._header_b64 = None
     
     def _load_key(self, key_data: str) -> jwk.JWK:
         """
@@ -112,6 +217,7 @@ class JWEHandler:
             
             # Create JWK key object
             key = jwk.JWK(kty='oct', k=base64.urlsafe_b64encode(key_bytes).decode('utf-8'))
+            self._key_bytes = key_bytes
             return key
             
         except Exception as e:
@@ -128,20 +234,103 @@ class JWEHandler:
         required_size = self.KEY_SIZES[self.content_encryption]
         key_bytes = secrets.token_bytes(required_size)
         key = jwk.JWK(kty='oct', k=base64.urlsafe_b64encode(key_bytes).decode('utf-8'))
+        self._key_bytes = key_bytes
         return key
     
-    def encrypt(self, payload: Dict[str, Any], kid: Optional[str] = None) -> str:
+    def _encode_protected_header(self, kid: Optional[str]) -> str:
+        """
+        Build the base64url-encoded JWE protected header
+        
+        Args:
+            kid: Key ID to include in the header (optional)
+            
+        Returns:
+            Base64url-encoded header JSON
+        """
+        protected_header = {
+            'alg': self.key_algorithm,
+            'enc': self.content_encryption
+        }
+        if kid:
+            protected_header['kid'] = kid
+        if self.compression:
+            protected_header['zip'] = self.compression
+        return _b64url_encode(json_encode(protected_header).encode('utf-8'))
+    
+    def _encrypt_gcm(self, plaintext: bytes, kid: Optional[str]) -> str:
+        """
+        Encrypt with AESGCM and build the JWE compact serialization
+        (header.encrypted_key.iv.ciphertext.tag, with an empty encrypted key for 'dir')
+        """
+        header_b64 = self._encode_protected_header(kid) if kid else self._header_b64
+        if self.compression == 'DEF':
+            plaintext = _deflate(plaintext)
+        iv = _NONCES.next_nonce()
+        # The ASCII of the encoded protected header is the additional authenticated data
+        sealed = self._aesgcm.encrypt(iv, plaintext, header_b64.encode('ascii'))
+        return '.'.join((
+            header_b64,
+            '',
+            _b64url_encode(iv),
+            _b64url_encode(sealed[:-GCM_TAG_SIZE]),
+            _b64url_encode(sealed[-GCM_TAG_SIZE:])
+        ))
+    
+    def _decrypt_gcm(self, jwe_token: str) -> Optional[bytes]:
+        """
+        Decrypt a compact JWE token with AESGCM
+        
+        Returns:
+            The plaintext, or None if the token uses features this path doesn't handle
+            (the caller then falls back to jwcrypto)
+        """
+        parts = jwe_token.split('.')
+        if len(parts) != 5 or parts[1]:
+            return None
+        
+        header_b64, _, iv_b64, ciphertext_b64, tag_b64 = parts
+        header = orjson.loads(_b64url_decode(header_b64))
+        if (not isinstance(header, dict)
+                or not _FAST_PATH_HEADER_FIELDS.issuperset(header)
+                or header.get('alg') != self.key_algorithm
+                or header.get('enc') != self.content_encryption
+                or header.get('zip') not in self.SUPPORTED_COMPRESSION):
+            return None
+        
+        iv = _b64url_decode(iv_b64)
+        tag = _b64url_decode(tag_b64)
+        if len(iv) != GCM_IV_SIZE or len(tag) != GCM_TAG_SIZE:
+            raise ValueError("Invalid JWE token: bad IV or authentication tag length")
+        
+        plaintext = self._aesgcm.decrypt(iv, _b64url_decode(ciphertext_b64) + tag, header_b64.encode('ascii'))
+        if header.get('zip') == 'DEF':
+            plaintext = _inflate(plaintext)
+        return plaintext
+    
+    def encrypt(self, payload: Union[Dict[str, Any], bytes], kid: Optional[str] = None) -> str:
         """
         Encrypt a payload using JWE
         
         Args:
-            payload: Dictionary containing the data to encrypt
+            payload: Dictionary containing the data to encrypt, or its already
+                serialized UTF-8 JSON bytes
             kid: Key ID to include in the JWE header (optional)
             
         Returns:
             JWE compact serialization string
         """
         try:
+            # Convert payload to JSON bytes unless the caller already serialized it
+            if isinstance(payload, bytes):
+                plaintext = payload
+            else:
+                plaintext = orjson.dumps(payload)
+            
+            if self._aesgcm is not None:
+                encrypted = self._encrypt_gcm(plaintext, kid)
+                logger.info(f"Successfully encrypted payload with {self.content_encryption}")
+                return encrypted
+            
             # Create JWE token
             protected_header = {
                 'alg': self.key_algorithm,
@@ -156,12 +345,9 @@ class JWEHandler:
             if self.compression:
                 protected_header['zip'] = self.compression
             
-            # Convert payload to JSON string
-            plaintext = json_encode(payload)
-            
             # Create and encrypt JWE token
             jwe_token = jwe.JWE(
-                plaintext=plaintext.encode('utf-8'),
+                plaintext=plaintext,
                 protected=protected_header
             )
             jwe_token.add_recipient(self.jwk_key)
@@ -187,6 +373,13 @@ class JWEHandler:
             Decrypted payload as dictionary
         """
         try:
+            if self._aesgcm is not None:
+                plaintext = self._decrypt_gcm(jwe_token)
+                if plaintext is not None:
+                    payload = orjson.loads(plaintext)
+                    logger.info("Successfully decrypted JWE token")
+                    return payload
+            
             # Create JWE object from token
             jwe_obj = jwe.JWE()
             jwe_obj.deserialize(jwe_token)
@@ -194,13 +387,10 @@ class JWEHandler:
             # Decrypt with the key
             jwe_obj.decrypt(self.jwk_key)
             
-            # Get the plaintext payload
-            plaintext = jwe_obj.payload.decode('utf-8')
-            
-            # Parse JSON
-            payload = json_decode(plaintext)
+            # Parse the JSON plaintext payload
+            payload = orjson.loads(jwe_obj.payload)
             
-            logger.info(f"Successfully decrypted JWE token")
+            logger.info("Successfully decrypted JWE token")
             return payload
             
         except Exception as e:
@@ -0,0 +1,33 @@
+"""
+SSL certificate and key path validation shared by the server startup scripts
+"""
+
+import os
+from typing import Tuple
+
+
+def _require_file(path: str, description: str) -> None:
+    """Raise FileNotFoundError unless path exists (a single stat call)"""
+    try:
+        os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{description} not found: {path}") from None
+
+
+def validate(certfile: str, keyfile: str) -> Tuple[str, str]:
+    """
+    Check that the SSL certificate and key files exist
+    
+    Args:
+        certfile: Path to the SSL certificate
+        keyfile: Path to the SSL private key
+        
+    Returns:
+        The (certfile, keyfile) paths, unchanged
+        
+    Raises:
+        FileNotFoundError: If either file is missing
+    """
+    _require_file(certfile, "SSL certificate")
+    _require_file(keyfile, "SSL key")
+    return certfile, keyfile